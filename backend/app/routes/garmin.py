@@ -19,6 +19,20 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/garmin", tags=["garmin"])
 
 
+def get_garmin_service(
+    current_user: UserResponse = Depends(get_current_user),
+) -> GarminService:
+    """Get GarminService instance for the current user.
+
+    This dependency function allows for easy mocking in tests
+    via app.dependency_overrides.
+
+    Returns:
+        GarminService instance scoped to the authenticated user
+    """
+    return GarminService(current_user.user_id)
+
+
 @router.get("/link", response_class=HTMLResponse)
 async def garmin_link_page(
     request: Request,
@@ -47,6 +61,7 @@ async def link_garmin_account(
     username: str = Form(...),
     password: str = Form(...),
     current_user: UserResponse = Depends(get_current_user),
+    service: GarminService = Depends(get_garmin_service),
     templates: Jinja2Templates = Depends(get_templates),
 ) -> Response:
     """Link Garmin account to user.
@@ -58,8 +73,6 @@ async def link_garmin_account(
     await csrf_protect.validate_csrf(request)
 
     try:
-        service = GarminService(current_user.user_id)
-
         success = await service.link_account(
             username=username,
             password=password,
@@ -118,6 +131,7 @@ async def sync_garmin_data(
     request: Request,
     csrf_protect: CsrfProtect = Depends(),
     current_user: UserResponse = Depends(get_current_user),
+    service: GarminService = Depends(get_garmin_service),
     templates: Jinja2Templates = Depends(get_templates),
 ) -> Response:
     """Manually trigger Garmin data sync.
@@ -127,8 +141,6 @@ async def sync_garmin_data(
     # Validate CSRF token FIRST
     await csrf_protect.validate_csrf(request)
 
-    service = GarminService(current_user.user_id)
-
     try:
         await service.sync_recent_data()
         # Return success HTML fragment
@@ -157,6 +169,7 @@ async def unlink_garmin_account(
     request: Request,
     csrf_protect: CsrfProtect = Depends(),
     current_user: UserResponse = Depends(get_current_user),
+    service: GarminService = Depends(get_garmin_service),
 ) -> dict[str, str]:
     """Unlink Garmin account by deleting tokens and cache.
 
@@ -167,8 +180,6 @@ async def unlink_garmin_account(
     # Validate CSRF token FIRST (checks X-CSRF-Token header for DELETE)
     await csrf_protect.validate_csrf(request)
 
-    service = GarminService(current_user.user_id)
-
     try:
         # Delete tokens and invalidate cache
         await service.unlink_account()
@@ -1,7 +1,9 @@
 """Garmin service for OAuth and data management."""
 
 import logging
-from datetime import date, timedelta
+import time
+from collections import OrderedDict
+from datetime import UTC, date, datetime, timedelta
 from typing import Any
 
 import garth
@@ -13,6 +15,46 @@ from app.utils.cache import GarminDataCache
 
 logger = logging.getLogger(__name__)
 
+# In-process L1 in front of the Firestore cache for daily metrics. The chat agent
+# builds a GarminService per tool call and re-reads the same days, so repeat reads
+# within the TTL skip the Firestore round trip. Keyed by (user_id, date_range);
+# values are (monotonic expiry, metrics dict), least recently used evicted past the
+# max size. Entries filled from Firestore never outlive the Firestore entry.
+# The L1 is per process: unlink_account only clears this process's entries, so other
+# workers can serve an unlinked user's metrics for up to DAILY_METRICS_L1_TTL_SECONDS.
+DAILY_METRICS_L1_TTL_SECONDS = 300
+DAILY_METRICS_L1_MAXSIZE = 1024
+_daily_metrics_l1: OrderedDict[tuple[str, str], tuple[float, dict[str, Any]]] = OrderedDict()
+
+
+def _l1_get(key: tuple[str, str]) -> dict[str, Any] | None:
+    """Return a copy of the L1 entry for key, dropping it if expired."""
+    entry = _daily_metrics_l1.get(key)
+    if entry is None:
+        return None
+    expires_at, value = entry
+    if time.monotonic() >= expires_at:
+        del _daily_metrics_l1[key]
+        return None
+    _daily_metrics_l1.move_to_end(key)
+    return dict(value)
+
+
+def _l1_set(key: tuple[str, str], value: dict[str, Any], ttl_seconds: float) -> None:
+    """Store value in the L1, evicting the least recently used entries past the max size."""
+    if ttl_seconds <= 0:
+        return
+    _daily_metrics_l1[key] = (time.monotonic() + ttl_seconds, dict(value))
+    _daily_metrics_l1.move_to_end(key)
+    while len(_daily_metrics_l1) > DAILY_METRICS_L1_MAXSIZE:
+        _daily_metrics_l1.popitem(last=False)
+
+
+def _l1_invalidate(user_id: str) -> None:
+    """Drop every L1 entry belonging to user_id."""
+    for key in [key for key in _daily_metrics_l1 if key[0] == user_id]:
+        del _daily_metrics_l1[key]
+
 
 class GarminService:
     """High-level Garmin integration service."""
@@ -68,6 +110,7 @@ class GarminService:
         await self.client.delete_tokens()
 
         # Invalidate all cached data for user
+        _l1_invalidate(self.user_id)
         await self.cache.invalidate(self.user_id)
 
         # Update user record
@@ -148,16 +191,27 @@ class GarminService:
             Dict with daily metrics (steps, resting_heart_rate, sleep_seconds, avg_stress_level)
         """
         date_range = str(target_date)
+        l1_key = (self.user_id, date_range)
+
+        # Check in-process L1 before Firestore
+        local = _l1_get(l1_key)
+        if local is not None:
+            return local
 
         # Check cache
         try:
-            cached = await self.cache.get(
+            cached, expires_at = await self.cache.get_with_expiry(
                 user_id=self.user_id, data_type="daily_metrics", date_range=date_range
             )
 
             if cached:
                 logger.debug("Cache hit for daily metrics %s", date_range)
                 result_dict: dict[str, Any] = cached
+                ttl_seconds: float = DAILY_METRICS_L1_TTL_SECONDS
+                if expires_at is not None:
+                    remaining = (expires_at - datetime.now(UTC)).total_seconds()
+                    ttl_seconds = min(ttl_seconds, remaining)
+                _l1_set(l1_key, result_dict, ttl_seconds)
                 return result_dict
         except Exception as e:
             logger.warning("Cache get error, falling back to API: %s", str(e))
@@ -179,6 +233,7 @@ class GarminService:
         except Exception as e:
             logger.warning("Cache set error (non-critical): %s", str(e))
 
+        _l1_set(l1_key, metrics_dict, DAILY_METRICS_L1_TTL_SECONDS)
         return metrics_dict
 
     async def get_user_profile(self) -> dict[str, Any]:
@@ -55,13 +55,31 @@ class GarminDataCache:
         Returns:
             Cached data if available and not expired, None otherwise
         """
+        data, _ = await self.get_with_expiry(user_id, data_type, **kwargs)
+        return data
+
+    async def get_with_expiry(
+        self, user_id: str, data_type: str, **kwargs: Any
+    ) -> tuple[Any | None, datetime | None]:
+        """
+        Get cached data together with the time the entry expires.
+
+        Args:
+            user_id: User identifier
+            data_type: Type of data to retrieve
+            **kwargs: Additional parameters for cache key
+
+        Returns:
+            (data, expires_at) for a live entry; (None, None) on a miss, expiry or error.
+            expires_at is None for entries stored without one.
+        """
         try:
             cache_key = self._cache_key(user_id, data_type, **kwargs)
 
             # Wrap synchronous Firestore operation
             doc = await asyncio.to_thread(self.collection.document(cache_key).get)
             if not doc.exists:
-                return None
+                return None, None
 
             cached = doc.to_dict()
 
@@ -71,14 +89,14 @@ class GarminDataCache:
                 # Expired - delete and return None (wrap synchronous operation)
                 await asyncio.to_thread(self.collection.document(cache_key).delete)
                 logger.debug("Cache expired and deleted: %s", cache_key)
-                return None
+                return None, None
 
             logger.debug("Cache hit: %s", cache_key)
-            return cached.get("data")
+            return cached.get("data"), expires_at
 
         except Exception as e:
             logger.error("Cache get error: %s", redact_for_logging(str(e)))
-            return None
+            return None, None
 
     async def set(
         self, user_id: str, data_type: str, data: Any, ttl: timedelta | None = None, **kwargs: Any
@@ -1,14 +1,22 @@
 """Shared test fixtures for all test types."""
 
+import copy
+import functools
 import os
+import re
+from contextlib import contextmanager
 from datetime import UTC, datetime
-from unittest.mock import AsyncMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
+import httpx
 import pytest
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.builder import HTMLParserTreeBuilder, LXMLTreeBuilder
 from fastapi.testclient import TestClient
 
 from app.auth.dependencies import get_user_service
 from app.auth.jwt import TokenData
+from app.auth.password import hash_password
 from app.main import app
 from app.models.user import User, UserProfile
 from app.services.user_service import UserService
@@ -22,10 +30,31 @@ os.environ.setdefault("OPENAI_API_KEY", "sk-test-key-for-testing-only")
 # Shared test constants
 TEST_PASSWORD = "TestPassword123!"  # noqa: S105 - Standard password for all test fixtures
 TEST_GARMIN_PASSWORD = "password123"  # noqa: S105 - Mock Garmin API password for E2E tests
+TEST_USER_TOKEN = "mock-jwt-token"  # noqa: S105 - Any bearer token resolves under mock_authentication
+
+# Forms render the token as <input type="hidden" name="fastapi-csrf-token" value="...">
+CSRF_TOKEN_RE = re.compile(rb'name="fastapi-csrf-token"[^>]*value="([^"]+)"')
+CSRF_STRAINER = SoupStrainer("input", attrs={"name": "fastapi-csrf-token"})
+# bs4 resets the builder for every soup, so one builder per backend serves all parses
+_LXML_BUILDER = LXMLTreeBuilder()
+_HTML_PARSER_BUILDER = HTMLParserTreeBuilder()
+
+
+@pytest.fixture(scope="session")
+def session_client():
+    """Single TestClient reused across the session.
+
+    Authenticated client fixtures hand this instance out instead of building a new
+    TestClient per test; reset_app_state clears its cookie jar between tests.
+    The app lifespan is not entered; the client is closed at session end.
+    """
+    client = TestClient(app, raise_server_exceptions=False)
+    yield client
+    client.close()
 
 
 @pytest.fixture(autouse=True)
-def reset_app_state():
+def reset_app_state(session_client):
     """Ensure dependency_overrides is clean before and after each test.
 
     This fixture runs automatically for every test to prevent state pollution
@@ -35,9 +64,13 @@ def reset_app_state():
 
     This solves the test isolation issue where running 'pytest tests/unit tests/integration'
     together caused 21 tests to fail, even though all tests pass when run separately.
+
+    Cookies on the shared session_client are cleared as well, so one test's
+    access_token or CSRF cookie never reaches the next.
     """
     # Clear before test (defensive - prevents pollution from previous tests)
     app.dependency_overrides.clear()
+    session_client.cookies.clear()
 
     yield
 
@@ -45,58 +78,205 @@ def reset_app_state():
     app.dependency_overrides.clear()
 
 
-@pytest.fixture
-def test_user():
-    """Test user data shared across all tests."""
-    return {
-        "user_id": "test-user-123",
-        "email": "test@example.com",
-        "password": "TestPassword123!",  # Used by integration tests that do actual login
-        "profile": {"display_name": "Test User"},
+@pytest.fixture(autouse=True)
+def reset_daily_metrics_l1():
+    """Clear GarminService's in-process daily-metrics L1 around every test.
+
+    The L1 is module-level, so entries cached by one test would otherwise be
+    served to the next test that reads the same user and date.
+    """
+    from app.services import garmin_service
+
+    garmin_service._daily_metrics_l1.clear()
+    yield
+    garmin_service._daily_metrics_l1.clear()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def offline_firestore_client():
+    """Keep the in-process app off real Firestore in every pytest process.
+
+    get_firestore_client() is lru_cached, so serial runs only passed because an
+    earlier unit test happened to leave a MagicMock in the cache. Under xdist each
+    worker starts with an empty cache, so stub the client for the whole session.
+    Tests that exercise the client itself still patch firestore.Client and clear
+    the cache on their own.
+    """
+    from app.db.firestore_client import get_firestore_client
+
+    get_firestore_client.cache_clear()
+    with patch("app.db.firestore_client.firestore.Client", MagicMock):
+        yield
+    get_firestore_client.cache_clear()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def jinja_bytecode_cache(pytestconfig, tmp_path_factory):
+    """Share compiled Jinja2 bytecode for the app templates across test processes.
+
+    Templates are compiled on first render in every pytest process (including each
+    xdist worker). Pointing the shared environment at a bytecode cache under
+    .pytest_cache lets later processes and runs load the compiled templates instead.
+    With the cache provider disabled (-p no:cacheprovider) a per-session temporary
+    directory is used. The environment's own bytecode cache is restored on teardown.
+    """
+    from jinja2 import FileSystemBytecodeCache
+
+    from app.dependencies import templates
+
+    cache = getattr(pytestconfig, "cache", None)
+    cache_dir = cache.mkdir("jinja2") if cache is not None else tmp_path_factory.mktemp("jinja2")
+    original = templates.env.bytecode_cache
+    templates.env.bytecode_cache = FileSystemBytecodeCache(directory=str(cache_dir))
+
+    yield
+
+    templates.env.bytecode_cache = original
+
+
+# Default (Garmin not linked) test user; the test_user fixture hands out copies
+DEFAULT_TEST_USER = {
+    "user_id": "test-user-123",
+    "email": "test@example.com",
+    "password": "TestPassword123!",  # Used by integration tests that do actual login
+    "profile": {"display_name": "Test User"},
+    "garmin_linked": False,
+}
+
+
+# Tests never assert on user timestamps, so a constant avoids clock reads
+FIXED_TIMESTAMP = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def build_test_user(
+    user_id: str = "test-user-123",
+    email: str = "test@example.com",
+    display_name: str = "Test User",
+    **overrides,
+) -> User:
+    """Build a validated User with fixed timestamps for route tests.
+
+    The password hash is a placeholder; tests that log in should use
+    build_mock_user_service instead.
+    """
+    fields = {
+        "user_id": user_id,
+        "email": email,
+        "hashed_password": "$2b$12$test",
+        "created_at": FIXED_TIMESTAMP,
+        "updated_at": FIXED_TIMESTAMP,
+        "profile": UserProfile(display_name=display_name),
         "garmin_linked": False,
     }
+    return User(**{**fields, **overrides})
 
 
-@pytest.fixture
-def create_mock_user_service():
-    """Factory fixture for creating mock UserService with different user states."""
+@functools.cache
+def cached_password_hash(password: str) -> str:
+    """Bcrypt-hash a test password once per process.
 
-    def _create_service(user_data: dict, include_auth: bool = True):
-        """Create a mock UserService.
+    hash_password costs ~0.2s by design, and every authenticated client fixture
+    builds a mock user; any valid hash of the password verifies the same way.
+    """
+    return hash_password(password)
 
-        Args:
-            user_data: Dict with user_id, email, password, profile, garmin_linked
-            include_auth: Whether to mock authenticate method (default True)
-        """
-        from app.auth.password import hash_password
 
-        mock_service = Mock(spec=UserService)
+class StubGarminService:
+    """Plain async stand-in for GarminService, served through get_garmin_service.
+
+    Outcomes are set through attributes and calls are recorded in plain lists,
+    avoiding Mock(spec=GarminService) introspecting the whole class per fixture.
+    """
+
+    def __init__(
+        self,
+        link_result: bool = True,
+        link_error: Exception | None = None,
+        sync_error: Exception | None = None,
+    ) -> None:
+        self.link_result = link_result
+        self.link_error = link_error
+        self.sync_error = sync_error
+        self.link_calls: list[dict[str, str]] = []
+        self.sync_calls: list[None] = []
+        self.unlink_calls: list[None] = []
+
+    async def link_account(self, username: str, password: str) -> bool:
+        self.link_calls.append({"username": username, "password": password})
+        if self.link_error is not None:
+            raise self.link_error
+        return self.link_result
+
+    async def unlink_account(self) -> bool:
+        self.unlink_calls.append(None)
+        return True
+
+    async def sync_recent_data(self) -> None:
+        self.sync_calls.append(None)
+        if self.sync_error is not None:
+            raise self.sync_error
+
+
+def build_mock_user_service(user_data: dict, include_auth: bool = True):
+    """Create a mock UserService.
+
+    Args:
+        user_data: Dict with user_id, email, password, profile, garmin_linked
+        include_auth: Whether to mock authenticate method (default True)
+    """
+    mock_service = Mock(spec=UserService)
+
+    # Mock get_user_by_id to return test user
+    mock_user = User(
+        user_id=user_data["user_id"],
+        email=user_data["email"],
+        hashed_password=cached_password_hash(user_data["password"]),
+        created_at=FIXED_TIMESTAMP,
+        updated_at=FIXED_TIMESTAMP,
+        profile=UserProfile(**user_data["profile"]),
+        garmin_linked=user_data["garmin_linked"],
+    )
+    mock_service.get_user_by_id = AsyncMock(return_value=mock_user)
+
+    # Mock authenticate method for login tests
+    if include_auth:
 
-        # Mock get_user_by_id to return test user
-        mock_user = User(
-            user_id=user_data["user_id"],
-            email=user_data["email"],
-            hashed_password=hash_password(user_data["password"]),
-            created_at=datetime.now(UTC),
-            updated_at=datetime.now(UTC),
-            profile=UserProfile(**user_data["profile"]),
-            garmin_linked=user_data["garmin_linked"],
-        )
-        mock_service.get_user_by_id = AsyncMock(return_value=mock_user)
+        async def mock_authenticate(email: str, password: str):
+            if email == user_data["email"] and password == user_data["password"]:
+                return mock_user
+            return None
 
-        # Mock authenticate method for login tests
-        if include_auth:
+        mock_service.authenticate = mock_authenticate
 
-            async def mock_authenticate(email: str, password: str):
-                if email == user_data["email"] and password == user_data["password"]:
-                    return mock_user
-                return None
+    return mock_service
 
-            mock_service.authenticate = mock_authenticate
 
-        return mock_service
+@contextmanager
+def mock_authentication(user_service, user_data: dict):
+    """Authenticate requests as user_data while the context is active.
 
-    return _create_service
+    Mocks JWT verification so any bearer token resolves to user_data, and
+    overrides the UserService dependency with user_service.
+    """
+    with patch("app.auth.dependencies.verify_token") as mock_verify:
+        mock_verify.return_value = TokenData(user_id=user_data["user_id"], email=user_data["email"])
+        app.dependency_overrides[get_user_service] = lambda: user_service
+        try:
+            yield
+        finally:
+            app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def test_user():
+    """Test user data shared across all tests."""
+    return copy.deepcopy(DEFAULT_TEST_USER)
+
+
+@pytest.fixture
+def create_mock_user_service():
+    """Factory fixture for creating mock UserService with different user states."""
+    return build_mock_user_service
 
 
 @pytest.fixture
@@ -106,33 +286,21 @@ def mock_user_service(create_mock_user_service, test_user):
 
 
 @pytest.fixture
-def create_authenticated_client():
+def create_authenticated_client(session_client):
     """Factory fixture for creating authenticated test clients."""
 
     def _create_client(user_service, user_data: dict, set_cookie: bool = False):
-        """Create an authenticated TestClient.
+        """Authenticate the shared session TestClient.
 
         Args:
             user_service: Mock UserService instance
             user_data: Dict with user_id and email for token
             set_cookie: Whether to set access_token cookie (default False)
         """
-        # Mock JWT verification using patch with explicit start/stop
-        patcher = patch("app.auth.dependencies.verify_token")
-        mock_verify = patcher.start()
-        mock_verify.return_value = TokenData(user_id=user_data["user_id"], email=user_data["email"])
-
-        # Override UserService dependency
-        app.dependency_overrides[get_user_service] = lambda: user_service
-
-        test_client = TestClient(app, raise_server_exceptions=False)
-        if set_cookie:
-            test_client.cookies.set("access_token", "Bearer mock-jwt-token")
-        yield test_client
-
-        # Cleanup: stop patch first, then clear overrides
-        patcher.stop()
-        app.dependency_overrides.clear()
+        with mock_authentication(user_service, user_data):
+            if set_cookie:
+                session_client.cookies.set("access_token", f"Bearer {TEST_USER_TOKEN}")
+            yield session_client
 
     return _create_client
 
@@ -143,10 +311,10 @@ def client(create_authenticated_client, mock_user_service, test_user):
     yield from create_authenticated_client(mock_user_service, test_user)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_user_token():
     """Mock JWT token for test user."""
-    return "mock-jwt-token"
+    return TEST_USER_TOKEN
 
 
 @pytest.fixture
@@ -173,7 +341,7 @@ def mock_user_service_linked_garmin(create_mock_user_service, test_user_linked_g
     return create_mock_user_service(test_user_linked_garmin, include_auth=False)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_user_linked_garmin_token():
     """Mock JWT token for user with linked Garmin."""
     return "mock-jwt-token-linked"
@@ -194,14 +362,12 @@ def create_mock_user():
     """Factory fixture for creating mock User instances with custom attributes."""
 
     def _create(**overrides):
-        from app.auth.password import hash_password
-
         defaults = {
             "user_id": "test-user-123",
             "email": "test@example.com",
-            "hashed_password": hash_password("TestPassword123!"),
-            "created_at": datetime.now(UTC),
-            "updated_at": datetime.now(UTC),
+            "hashed_password": cached_password_hash(TEST_PASSWORD),
+            "created_at": FIXED_TIMESTAMP,
+            "updated_at": FIXED_TIMESTAMP,
             "profile": UserProfile(display_name="Test User"),
             "garmin_linked": False,
         }
@@ -211,13 +377,14 @@ def create_mock_user():
 
 
 @pytest.fixture
-def unauthenticated_client():
+def unauthenticated_client(session_client):
     """Provide TestClient without authentication for testing auth flows.
 
     No dependency overrides are set. The autouse reset_app_state fixture
-    handles clearing any existing overrides before this fixture runs.
+    clears any existing overrides and the shared client's cookies before this
+    fixture runs.
     """
-    return TestClient(app, raise_server_exceptions=False)
+    return session_client
     # No cleanup needed - autouse fixture handles it
 
 
@@ -244,9 +411,14 @@ def mock_user_service_override():
     return _override
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def templates():
-    """Provide Jinja2 template environment for unit testing templates directly."""
+    """Provide Jinja2 template environment for unit testing templates directly.
+
+    Session-scoped so each template is loaded and compiled once; tests only render.
+    Templates do not change during a run, so auto_reload is off and cached templates
+    are returned without re-checking their source files.
+    """
     from pathlib import Path
 
     from jinja2 import Environment, FileSystemLoader, select_autoescape
@@ -256,16 +428,45 @@ def templates():
     return Environment(
         loader=FileSystemLoader(str(template_dir)),
         autoescape=select_autoescape(["html", "xml"]),  # Security: Enable autoescape for HTML
+        auto_reload=False,
     )
 
 
+def extract_csrf_token(response: httpx.Response) -> str:
+    """Extract the CSRF form token value from a rendered page or fragment."""
+    match = CSRF_TOKEN_RE.search(response.content)
+    assert match is not None, "CSRF token field 'fastapi-csrf-token' not found in HTML"
+    return match.group(1).decode()
+
+
+def parse_csrf_input(response: httpx.Response):
+    """Parse only the CSRF <input> out of a page, or None if it is missing.
+
+    Feeding bs4 the raw bytes with a known encoding skips its charset detection,
+    and the strainer keeps lxml from building the rest of the tree.
+    """
+    return BeautifulSoup(
+        response.content,
+        builder=_LXML_BUILDER,
+        from_encoding="utf-8",
+        parse_only=CSRF_STRAINER,
+    ).find("input")
+
+
+def fragment_soup(markup: str) -> BeautifulSoup:
+    """Parse an HTML fragment with html.parser, keeping its root elements top-level.
+
+    lxml wraps fragments in <html><body>, so tests that inspect a fragment's
+    top-level elements use this instead of an lxml parse.
+    """
+    return BeautifulSoup(markup, builder=_HTML_PARSER_BUILDER)
+
+
 def get_csrf_token(client, endpoint="/register"):
     """Get CSRF token from a form endpoint.
 
     Returns tuple of (csrf_token, csrf_cookie) for use in POST requests.
     """
-    from bs4 import BeautifulSoup
-
     response = client.get(endpoint)
     assert response.status_code == 200, (
         f"Failed to get form from {endpoint}: {response.status_code}"
@@ -276,11 +477,30 @@ def get_csrf_token(client, endpoint="/register"):
     assert csrf_cookie is not None, "CSRF cookie 'fastapi-csrf-token' not set"
 
     # Get token from HTML (library uses fastapi-csrf-token as field name)
-    soup = BeautifulSoup(response.text, "html.parser")
-    csrf_input = soup.find("input", {"name": "fastapi-csrf-token"})
-    assert csrf_input is not None, (
-        f"CSRF token field 'fastapi-csrf-token' not found in HTML from {endpoint}"
-    )
-    csrf_token = csrf_input["value"]
+    return extract_csrf_token(response), csrf_cookie
+
+
+@pytest.fixture(scope="session")
+def csrf_pair():
+    """(csrf_token, csrf_cookie) pair minted directly by the app's CsrfProtect config.
+
+    Tokens are not bound to a form or route, so tests that only need a valid pair
+    skip the GET and template render entirely. Tests asserting rotation or the
+    rendered form field must still fetch the page themselves.
+    """
+    from fastapi_csrf_protect.flexible import CsrfProtect
+
+    csrf_token, signed_token = CsrfProtect().generate_csrf_tokens()
+    return csrf_token, signed_token
+
 
-    return csrf_token, csrf_cookie
+def asgi_client(cookies: dict[str, str] | None = None) -> httpx.AsyncClient:
+    """AsyncClient that calls the app in-process through httpx.ASGITransport.
+
+    For markup-only assertions from async tests and fixtures, this skips the
+    TestClient portal thread. Redirects are not followed, and the app's lifespan
+    is not run. Use it as an async context manager so the client is closed.
+    """
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://testserver", cookies=cookies
+    )
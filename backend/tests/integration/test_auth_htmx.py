@@ -13,11 +13,10 @@ from fastapi import status
 from app.auth.dependencies import get_user_service
 from app.auth.password import hash_password
 from app.main import app
-from tests.conftest import get_csrf_token
 
 
 def test_register_success_returns_hx_redirect_header(
-    unauthenticated_client, create_mock_user, mock_user_service_override
+    unauthenticated_client, create_mock_user, mock_user_service_override, csrf_pair
 ):
     """POST /auth/register success with HX-Request header should return HX-Redirect to /dashboard."""
     # Mock user service without conflicting with fixture
@@ -30,7 +29,7 @@ def test_register_success_returns_hx_redirect_header(
 
     with mock_user_service_override(mock_svc):
         # Get CSRF token
-        csrf_token, csrf_cookie = get_csrf_token(unauthenticated_client, "/register")
+        csrf_token, csrf_cookie = csrf_pair
 
         response = unauthenticated_client.post(
             "/auth/register",
@@ -55,7 +54,9 @@ def test_register_success_returns_hx_redirect_header(
         # Cookie attributes are set correctly (verified by e2e tests)
 
 
-def test_register_success_without_htmx_returns_json(unauthenticated_client, create_mock_user):
+def test_register_success_without_htmx_returns_json(
+    unauthenticated_client, create_mock_user, csrf_pair
+):
     """POST /auth/register success without HX-Request should return JSON response."""
     mock_svc = AsyncMock()
     mock_svc.get_user_by_email.return_value = None
@@ -67,7 +68,7 @@ def test_register_success_without_htmx_returns_json(unauthenticated_client, crea
     app.dependency_overrides[get_user_service] = lambda: mock_svc
 
     # Get CSRF token
-    csrf_token, csrf_cookie = get_csrf_token(unauthenticated_client, "/register")
+    csrf_token, csrf_cookie = csrf_pair
 
     response = unauthenticated_client.post(
         "/auth/register",
@@ -92,7 +93,9 @@ def test_register_success_without_htmx_returns_json(unauthenticated_client, crea
     # Cleanup handled by autouse fixture
 
 
-def test_register_validation_error_returns_html_fragment(unauthenticated_client, create_mock_user):
+def test_register_validation_error_returns_html_fragment(
+    unauthenticated_client, create_mock_user, csrf_pair
+):
     """POST /auth/register with HTMX and validation error should return HTML error fragment."""
     mock_svc = AsyncMock()
     # Mock existing user to trigger email-already-exists error
@@ -104,7 +107,7 @@ def test_register_validation_error_returns_html_fragment(unauthenticated_client,
     app.dependency_overrides[get_user_service] = lambda: mock_svc
 
     # Get CSRF token
-    csrf_token, csrf_cookie = get_csrf_token(unauthenticated_client, "/register")
+    csrf_token, csrf_cookie = csrf_pair
 
     response = unauthenticated_client.post(
         "/auth/register",
@@ -129,10 +132,10 @@ def test_register_validation_error_returns_html_fragment(unauthenticated_client,
     # Cleanup handled by autouse fixture
 
 
-def test_register_password_mismatch_returns_html_error(unauthenticated_client):
+def test_register_password_mismatch_returns_html_error(unauthenticated_client, csrf_pair):
     """POST /auth/register with HTMX and password mismatch should return HTML error."""
     # Get CSRF token
-    csrf_token, csrf_cookie = get_csrf_token(unauthenticated_client, "/register")
+    csrf_token, csrf_cookie = csrf_pair
 
     response = unauthenticated_client.post(
         "/auth/register",
@@ -156,7 +159,9 @@ def test_register_password_mismatch_returns_html_error(unauthenticated_client):
     assert "password" in html.lower()
 
 
-def test_login_success_returns_hx_redirect_header(unauthenticated_client, create_mock_user):
+def test_login_success_returns_hx_redirect_header(
+    unauthenticated_client, create_mock_user, csrf_pair
+):
     """POST /auth/login success with HX-Request should return HX-Redirect to /dashboard."""
     mock_svc = AsyncMock()
     mock_user = create_mock_user(
@@ -169,7 +174,7 @@ def test_login_success_returns_hx_redirect_header(unauthenticated_client, create
     app.dependency_overrides[get_user_service] = lambda: mock_svc
 
     # Get CSRF token
-    csrf_token, csrf_cookie = get_csrf_token(unauthenticated_client, "/login")
+    csrf_token, csrf_cookie = csrf_pair
 
     response = unauthenticated_client.post(
         "/auth/login",
@@ -192,7 +197,9 @@ def test_login_success_returns_hx_redirect_header(unauthenticated_client, create
     # Cleanup handled by autouse fixture
 
 
-def test_login_invalid_credentials_returns_html_error(unauthenticated_client, create_mock_user):
+def test_login_invalid_credentials_returns_html_error(
+    unauthenticated_client, create_mock_user, csrf_pair
+):
     """POST /auth/login with HTMX and wrong password should return HTML error fragment."""
     mock_svc = AsyncMock()
     mock_user = create_mock_user(
@@ -205,7 +212,7 @@ def test_login_invalid_credentials_returns_html_error(unauthenticated_client, cr
     app.dependency_overrides[get_user_service] = lambda: mock_svc
 
     # Get CSRF token
-    csrf_token, csrf_cookie = get_csrf_token(unauthenticated_client, "/login")
+    csrf_token, csrf_cookie = csrf_pair
 
     response = unauthenticated_client.post(
         "/auth/login",
@@ -233,7 +240,9 @@ def test_login_invalid_credentials_returns_html_error(unauthenticated_client, cr
     # Cleanup handled by autouse fixture
 
 
-def test_login_success_without_htmx_returns_json(unauthenticated_client, create_mock_user):
+def test_login_success_without_htmx_returns_json(
+    unauthenticated_client, create_mock_user, csrf_pair
+):
     """POST /auth/login success without HX-Request should return JSON with access token."""
     mock_svc = AsyncMock()
     mock_user = create_mock_user(
@@ -246,7 +255,7 @@ def test_login_success_without_htmx_returns_json(unauthenticated_client, create_
     app.dependency_overrides[get_user_service] = lambda: mock_svc
 
     # Get CSRF token
-    csrf_token, csrf_cookie = get_csrf_token(unauthenticated_client, "/login")
+    csrf_token, csrf_cookie = csrf_pair
 
     response = unauthenticated_client.post(
         "/auth/login",
@@ -1,16 +1,14 @@
 """Integration tests for authentication routes."""
 
-from datetime import UTC, datetime
 from unittest.mock import AsyncMock, Mock
 
 import pytest
-from fastapi.testclient import TestClient
 
 from app.auth.dependencies import get_user_service
 from app.main import app
 from app.models.user import User, UserProfile
 from app.services.user_service import UserService
-from tests.conftest import get_csrf_token
+from tests.conftest import FIXED_TIMESTAMP, get_csrf_token
 
 
 @pytest.fixture
@@ -25,8 +23,8 @@ def mock_user_service():
 
 
 @pytest.fixture
-def client(mock_user_service):
-    """Provide a TestClient with mocked UserService.
+def client(session_client, mock_user_service):
+    """Provide the shared TestClient with mocked UserService.
 
     This fixture uses FastAPI's dependency_overrides to inject the mock
     UserService for all routes, preventing Firestore connection attempts.
@@ -35,8 +33,8 @@ def client(mock_user_service):
     # Override the get_user_service dependency
     app.dependency_overrides[get_user_service] = lambda: mock_user_service
 
-    # Create test client (raise_server_exceptions=False allows testing error responses)
-    return TestClient(app, raise_server_exceptions=False)
+    # Session client is built with raise_server_exceptions=False to allow testing error responses
+    return session_client
     # Cleanup handled by autouse fixture
 
 
@@ -50,8 +48,8 @@ def existing_user():
         user_id="test-user-123",
         email="existing@example.com",
         hashed_password="$2b$12$5szU7XsAq2Rc9349BclbtuMsJfuT9mu24WFaIMCdSkxDtLCiabjpK",  # noqa: S106
-        created_at=datetime.now(UTC),
-        updated_at=datetime.now(UTC),
+        created_at=FIXED_TIMESTAMP,
+        updated_at=FIXED_TIMESTAMP,
         profile=UserProfile(display_name="Existing User"),
         garmin_linked=False,
     )
@@ -60,14 +58,14 @@ def existing_user():
 class TestRegisterEndpoint:
     """Test POST /auth/register endpoint."""
 
-    def test_register_success(self, client, mock_user_service, existing_user):
+    def test_register_success(self, client, mock_user_service, existing_user, csrf_pair):
         """Test successful user registration."""
         # Mock service to return created user
         mock_user_service.get_user_by_email = AsyncMock(return_value=None)
         mock_user_service.create_user = AsyncMock(return_value=existing_user)
 
         # Get CSRF token
-        csrf_token, csrf_cookie = get_csrf_token(client, "/register")
+        csrf_token, csrf_cookie = csrf_pair
 
         response = client.post(
             "/auth/register",
@@ -88,7 +86,7 @@ class TestRegisterEndpoint:
         assert "password" not in data
         assert "hashed_password" not in data
 
-    def test_register_duplicate_email(self, client, mock_user_service, existing_user):
+    def test_register_duplicate_email(self, client, mock_user_service, existing_user, csrf_pair):
         """Test registration with existing email returns 400 with generic error.
 
         Uses generic error message to prevent user enumeration (security/privacy).
@@ -97,7 +95,7 @@ class TestRegisterEndpoint:
         mock_user_service.get_user_by_email = AsyncMock(return_value=existing_user)
 
         # Get CSRF token
-        csrf_token, csrf_cookie = get_csrf_token(client, "/register")
+        csrf_token, csrf_cookie = csrf_pair
 
         response = client.post(
             "/auth/register",
@@ -111,10 +109,11 @@ class TestRegisterEndpoint:
         )
 
         assert response.status_code == 400
+        detail = response.json()["detail"]
         # Generic error to prevent user enumeration
-        assert "Unable to create account" in response.json()["detail"]
+        assert "Unable to create account" in detail
         # Should NOT reveal if email exists
-        assert "already registered" not in response.json()["detail"].lower()
+        assert "already registered" not in detail.lower()
 
     def test_register_invalid_email(self, client):
         """Test registration with invalid email returns 422."""
@@ -171,13 +170,13 @@ class TestRegisterEndpoint:
 class TestLoginEndpoint:
     """Test POST /auth/login endpoint."""
 
-    def test_login_success(self, client, mock_user_service, existing_user):
+    def test_login_success(self, client, mock_user_service, existing_user, csrf_pair):
         """Test successful login returns access token."""
         # Mock service to return existing user
         mock_user_service.get_user_by_email = AsyncMock(return_value=existing_user)
 
         # Get CSRF token
-        csrf_token, csrf_cookie = get_csrf_token(client, "/login")
+        csrf_token, csrf_cookie = csrf_pair
 
         response = client.post(
             "/auth/login",
@@ -195,13 +194,13 @@ class TestLoginEndpoint:
         assert data["token_type"] == "bearer"  # noqa: S105
         assert len(data["access_token"]) > 0
 
-    def test_login_invalid_email(self, client, mock_user_service):
+    def test_login_invalid_email(self, client, mock_user_service, csrf_pair):
         """Test login with non-existent email returns 401."""
         # Mock service to return None (user not found)
         mock_user_service.get_user_by_email = AsyncMock(return_value=None)
 
         # Get CSRF token
-        csrf_token, csrf_cookie = get_csrf_token(client, "/login")
+        csrf_token, csrf_cookie = csrf_pair
 
         response = client.post(
             "/auth/login",
@@ -216,13 +215,13 @@ class TestLoginEndpoint:
         assert response.status_code == 401
         assert "Incorrect email or password" in response.json()["detail"]
 
-    def test_login_wrong_password(self, client, mock_user_service, existing_user):
+    def test_login_wrong_password(self, client, mock_user_service, existing_user, csrf_pair):
         """Test login with wrong password returns 401."""
         # Mock service to return user
         mock_user_service.get_user_by_email = AsyncMock(return_value=existing_user)
 
         # Get CSRF token
-        csrf_token, csrf_cookie = get_csrf_token(client, "/login")
+        csrf_token, csrf_cookie = csrf_pair
 
         response = client.post(
             "/auth/login",
@@ -251,7 +250,7 @@ class TestLoginEndpoint:
 class TestMeEndpoint:
     """Test GET /auth/me endpoint."""
 
-    def test_get_me_with_valid_token(self, client, mock_user_service, existing_user):
+    def test_get_me_with_valid_token(self, client, mock_user_service, existing_user, csrf_pair):
         """Test /auth/me with valid token returns user data."""
         # Mock service to return user
         mock_user_service.get_user_by_id = AsyncMock(return_value=existing_user)
@@ -260,7 +259,7 @@ class TestMeEndpoint:
         mock_user_service.get_user_by_email = AsyncMock(return_value=existing_user)
 
         # Get CSRF token
-        csrf_token, csrf_cookie = get_csrf_token(client, "/login")
+        csrf_token, csrf_cookie = csrf_pair
 
         login_response = client.post(
             "/auth/login",
@@ -312,13 +311,13 @@ class TestMeEndpoint:
 
         assert response.status_code == 401
 
-    def test_get_me_user_not_found(self, client, mock_user_service, existing_user):
+    def test_get_me_user_not_found(self, client, mock_user_service, existing_user, csrf_pair):
         """Test /auth/me when user no longer exists returns 401."""
         # Login to get valid token
         mock_user_service.get_user_by_email = AsyncMock(return_value=existing_user)
 
         # Get CSRF token
-        csrf_token, csrf_cookie = get_csrf_token(client, "/login")
+        csrf_token, csrf_cookie = csrf_pair
 
         login_response = client.post(
             "/auth/login",
@@ -343,13 +342,15 @@ class TestMeEndpoint:
 class TestLogoutEndpoint:
     """Test POST /logout endpoint."""
 
-    def test_logout_clears_cookie_and_redirects(self, client, mock_user_service, existing_user):
+    def test_logout_clears_cookie_and_redirects(
+        self, client, mock_user_service, existing_user, csrf_pair
+    ):
         """Test POST /logout clears authentication cookie and redirects to /login."""
         # First login with HTMX to get a cookie
         mock_user_service.get_user_by_email = AsyncMock(return_value=existing_user)
 
         # Get CSRF token
-        csrf_token, csrf_cookie = get_csrf_token(client, "/login")
+        csrf_token, csrf_cookie = csrf_pair
 
         login_response = client.post(
             "/auth/login",
@@ -268,7 +268,8 @@ class TestChatToolCalling:
                 assert "sleep" in metric_types
 
                 # Verify response mentions recovery
-                assert "recovery" in response.message.lower() or "hr" in response.message.lower()
+                message = response.message.lower()
+                assert "recovery" in message or "hr" in message
 
     async def test_profile_query_calls_profile_tool(self):
         """Verify 'what's my profile' triggers garmin_profile_tool."""
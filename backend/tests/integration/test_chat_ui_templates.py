@@ -5,45 +5,95 @@ Tests template rendering for:
 - Settings page components (Phase 2)
 """
 
+import httpx
+import pytest
 from fastapi.testclient import TestClient
 
+from tests.conftest import (
+    DEFAULT_TEST_USER,
+    TEST_USER_TOKEN,
+    asgi_client,
+    build_mock_user_service,
+    mock_authentication,
+)
+
+
+def _page_html(response: httpx.Response) -> str:
+    """Return the rendered page body, failing fast if the page did not render."""
+    if response.status_code != 200:
+        pytest.fail(f"GET {response.request.url.path} returned {response.status_code}")
+    return response.text
+
+
+async def _fetch_page_html(path: str, token: str) -> str:
+    """GET path in-process with token as the access_token cookie and return its body."""
+    async with asgi_client(cookies={"access_token": f"Bearer {token}"}) as client:
+        return _page_html(await client.get(path))
+
+
+@pytest.fixture
+async def chat_page_html(mock_user_service, test_user: dict, test_user_token: str) -> str:
+    """Rendered /chat/ page for the default (Garmin not linked) test user."""
+    with mock_authentication(mock_user_service, test_user):
+        return await _fetch_page_html("/chat/", test_user_token)
+
+
+@pytest.fixture
+async def settings_page_html(mock_user_service, test_user: dict, test_user_token: str) -> str:
+    """Rendered /settings page for the default (Garmin not linked) test user."""
+    with mock_authentication(mock_user_service, test_user):
+        return await _fetch_page_html("/settings", test_user_token)
+
+
+@pytest.fixture
+async def linked_settings_page_html(
+    mock_user_service_linked_garmin,
+    test_user_linked_garmin: dict,
+    test_user_linked_garmin_token: str,
+) -> str:
+    """Rendered /settings page for a user with a linked Garmin account."""
+    with mock_authentication(mock_user_service_linked_garmin, test_user_linked_garmin):
+        return await _fetch_page_html("/settings", test_user_linked_garmin_token)
+
 
 # Phase 3: Garmin Banner Tests
+@pytest.fixture(scope="module")
+async def banner_chat_page_html() -> str:
+    """Rendered /chat/ page for an unlinked user, fetched once for all banner checks."""
+    with mock_authentication(build_mock_user_service(DEFAULT_TEST_USER), DEFAULT_TEST_USER):
+        return await _fetch_page_html("/chat/", TEST_USER_TOKEN)
+
+
 class TestGarminBanner:
     """Tests for Garmin connection banner on chat page."""
 
-    def test_banner_appears_when_garmin_not_linked(self, client: TestClient, test_user_token: str):
-        """Banner should appear when user has not linked Garmin account."""
-        response = client.get("/chat/", cookies={"access_token": f"Bearer {test_user_token}"})
-        assert response.status_code == 200
-        assert 'id="garmin-banner"' in response.text
-        assert 'data-testid="garmin-banner"' in response.text
-
-    def test_banner_has_link_to_garmin_oauth(self, client: TestClient, test_user_token: str):
-        """Banner should include Link Now button to /garmin/link."""
-        response = client.get("/chat/", cookies={"access_token": f"Bearer {test_user_token}"})
-        assert response.status_code == 200
-        assert 'href="/garmin/link"' in response.text
-        assert 'data-testid="banner-link-now"' in response.text
-        assert "Link Now" in response.text
-
-    def test_banner_has_dismiss_button(self, client: TestClient, test_user_token: str):
-        """Banner should include dismiss button with correct ID."""
-        response = client.get("/chat/", cookies={"access_token": f"Bearer {test_user_token}"})
-        assert response.status_code == 200
-        assert 'id="dismiss-banner"' in response.text
-        assert 'data-testid="banner-dismiss"' in response.text
+    @pytest.mark.parametrize(
+        "needle",
+        [
+            # Banner appears when Garmin is not linked
+            'id="garmin-banner"',
+            'data-testid="garmin-banner"',
+            # Link Now button to /garmin/link
+            'href="/garmin/link"',
+            'data-testid="banner-link-now"',
+            "Link Now",
+            # Dismiss button
+            'id="dismiss-banner"',
+            'data-testid="banner-dismiss"',
+        ],
+    )
+    def test_banner_markup(self, banner_chat_page_html: str, needle: str):
+        """Banner markup should be present when user has not linked Garmin account."""
+        assert needle in banner_chat_page_html
 
 
 class TestBannerDismissalScript:
     """Tests for banner dismissal JavaScript logic."""
 
-    def test_banner_dismissal_script_included(self, client: TestClient, test_user_token: str):
+    def test_banner_dismissal_script_included(self, chat_page_html: str):
         """Chat page should include banner dismissal script with localStorage."""
-        response = client.get("/chat/", cookies={"access_token": f"Bearer {test_user_token}"})
-        assert response.status_code == 200
         # Check for localStorage key used in dismissal logic
-        assert "garmin-banner-dismissed" in response.text
+        assert "garmin-banner-dismissed" in chat_page_html
 
 
 class TestLoginHandler:
@@ -51,133 +101,93 @@ class TestLoginHandler:
 
     def test_login_clears_localstorage_on_page_load(self, client: TestClient):
         """Login page should clear banner dismissed state on load."""
-        response = client.get("/")
-        assert response.status_code == 200
+        html = _page_html(client.get("/"))
         # Script should contain removeItem for banner dismissed state
-        assert "removeItem" in response.text
-        assert "garmin-banner-dismissed" in response.text
+        assert "removeItem" in html
+        assert "garmin-banner-dismissed" in html
 
 
 # Phase 2: Settings Page Tests
-def test_settings_page_renders_with_user_context(client: TestClient, test_user_token: str) -> None:
+def test_settings_page_renders_with_user_context(settings_page_html: str) -> None:
     """Settings page should render for authenticated user."""
-    response = client.get("/settings", cookies={"access_token": f"Bearer {test_user_token}"})
-
-    assert response.status_code == 200
-    assert "Settings" in response.text
-    assert "Back to Chat" in response.text
-    assert 'data-testid="settings-header"' in response.text
+    assert "Settings" in settings_page_html
+    assert "Back to Chat" in settings_page_html
+    assert 'data-testid="settings-header"' in settings_page_html
 
 
-def test_settings_shows_garmin_connected(
-    client_linked_garmin: TestClient,
-) -> None:
+def test_settings_shows_garmin_connected(linked_settings_page_html: str) -> None:
     """Verify settings page displays 'Connected' status when user has linked Garmin account."""
-    response = client_linked_garmin.get("/settings")
+    assert "Connected" in linked_settings_page_html
+    assert 'data-testid="garmin-status-connected"' in linked_settings_page_html
 
-    assert response.status_code == 200
-    assert "Connected" in response.text
-    assert 'data-testid="garmin-status-connected"' in response.text
 
-
-def test_settings_shows_garmin_not_connected(client: TestClient, test_user_token: str) -> None:
+def test_settings_shows_garmin_not_connected(settings_page_html: str) -> None:
     """Verify settings page displays 'Not connected' status when user hasn't linked Garmin account."""
-    response = client.get("/settings", cookies={"access_token": f"Bearer {test_user_token}"})
-
-    assert response.status_code == 200
-    assert "Not connected" in response.text
-    assert 'data-testid="garmin-status-not-connected"' in response.text
+    assert "Not connected" in settings_page_html
+    assert 'data-testid="garmin-status-not-connected"' in settings_page_html
 
 
-def test_settings_has_navigation_links(client: TestClient, test_user_token: str) -> None:
+def test_settings_has_navigation_links(settings_page_html: str) -> None:
     """Verify settings page includes navigation links (back to chat, manage Garmin)."""
-    response = client.get("/settings", cookies={"access_token": f"Bearer {test_user_token}"})
-
-    assert response.status_code == 200
     # Back to Chat link
-    assert 'href="/chat/"' in response.text
-    assert 'data-testid="link-back-to-chat"' in response.text
+    assert 'href="/chat/"' in settings_page_html
+    assert 'data-testid="link-back-to-chat"' in settings_page_html
     # Garmin manage link
-    assert 'href="/garmin/link"' in response.text
-    assert 'data-testid="link-manage-garmin"' in response.text
+    assert 'href="/garmin/link"' in settings_page_html
+    assert 'data-testid="link-manage-garmin"' in settings_page_html
 
 
-def test_garmin_card_connected(
-    client_linked_garmin: TestClient,
-) -> None:
+def test_garmin_card_connected(linked_settings_page_html: str) -> None:
     """Verify Garmin card displays 'Connected' status with appropriate UI elements when linked."""
-    response = client_linked_garmin.get("/settings")
+    assert 'data-testid="card-garmin"' in linked_settings_page_html
+    assert 'data-testid="garmin-status-connected"' in linked_settings_page_html
+    assert "Connected" in linked_settings_page_html
 
-    assert response.status_code == 200
-    assert 'data-testid="card-garmin"' in response.text
-    assert 'data-testid="garmin-status-connected"' in response.text
-    assert "Connected" in response.text
 
-
-def test_garmin_card_not_connected(client: TestClient, test_user_token: str) -> None:
+def test_garmin_card_not_connected(settings_page_html: str) -> None:
     """Verify Garmin card displays 'Not connected' status when account is not linked."""
-    response = client.get("/settings", cookies={"access_token": f"Bearer {test_user_token}"})
-
-    assert response.status_code == 200
-    assert 'data-testid="card-garmin"' in response.text
-    assert 'data-testid="garmin-status-not-connected"' in response.text
-    assert "Not connected" in response.text
+    assert 'data-testid="card-garmin"' in settings_page_html
+    assert 'data-testid="garmin-status-not-connected"' in settings_page_html
+    assert "Not connected" in settings_page_html
 
 
-def test_garmin_card_has_manage_link(client: TestClient, test_user_token: str) -> None:
+def test_garmin_card_has_manage_link(settings_page_html: str) -> None:
     """Garmin card should include 'Manage' link to /garmin/link."""
-    response = client.get("/settings", cookies={"access_token": f"Bearer {test_user_token}"})
-
-    assert response.status_code == 200
-    assert 'data-testid="link-manage-garmin"' in response.text
-    assert 'href="/garmin/link"' in response.text
-    assert "Manage" in response.text
+    assert 'data-testid="link-manage-garmin"' in settings_page_html
+    assert 'href="/garmin/link"' in settings_page_html
+    assert "Manage" in settings_page_html
 
 
-def test_profile_card_shows_email(
-    client: TestClient, test_user_token: str, test_user_email: str
-) -> None:
+def test_profile_card_shows_email(settings_page_html: str, test_user_email: str) -> None:
     """Verify profile card displays the user's email address."""
-    response = client.get("/settings", cookies={"access_token": f"Bearer {test_user_token}"})
+    assert 'data-testid="card-profile"' in settings_page_html
+    assert 'data-testid="profile-email"' in settings_page_html
+    assert test_user_email in settings_page_html
 
-    assert response.status_code == 200
-    assert 'data-testid="card-profile"' in response.text
-    assert 'data-testid="profile-email"' in response.text
-    assert test_user_email in response.text
 
-
-def test_profile_card_has_edit_link(client: TestClient, test_user_token: str) -> None:
+def test_profile_card_has_edit_link(settings_page_html: str) -> None:
     """Profile card should include 'Edit' link with 'Coming Soon' badge."""
-    response = client.get("/settings", cookies={"access_token": f"Bearer {test_user_token}"})
-
-    assert response.status_code == 200
-    assert 'data-testid="link-edit-profile"' in response.text
-    assert 'href="#"' in response.text
-    assert "Edit" in response.text
-    assert "Coming Soon" in response.text
-    assert "onclick" in response.text
+    assert 'data-testid="link-edit-profile"' in settings_page_html
+    assert 'href="#"' in settings_page_html
+    assert "Edit" in settings_page_html
+    assert "Coming Soon" in settings_page_html
+    assert "onclick" in settings_page_html
 
 
 # Phase 4: Chat Header Navigation Tests
 class TestChatHeaderNavigation:
     """Tests for chat header navigation elements."""
 
-    def test_chat_header_has_settings_icon_link(self, client: TestClient, test_user_token: str):
+    def test_chat_header_has_settings_icon_link(self, chat_page_html: str):
         """Chat header should include settings icon link to /settings."""
-        response = client.get("/chat/", cookies={"access_token": f"Bearer {test_user_token}"})
-        assert response.status_code == 200
-        assert 'data-testid="link-settings"' in response.text
-        assert 'href="/settings"' in response.text
+        assert 'data-testid="link-settings"' in chat_page_html
+        assert 'href="/settings"' in chat_page_html
         # Check for aria-label for accessibility
-        assert 'aria-label="Settings"' in response.text
+        assert 'aria-label="Settings"' in chat_page_html
 
-    def test_chat_header_no_longer_has_dashboard_link(
-        self, client: TestClient, test_user_token: str
-    ):
+    def test_chat_header_no_longer_has_dashboard_link(self, chat_page_html: str):
         """Chat header should NOT include 'Dashboard' text link."""
-        response = client.get("/chat/", cookies={"access_token": f"Bearer {test_user_token}"})
-        assert response.status_code == 200
         # Should not have a link with text "Dashboard" in the header
         # Note: We're checking the header doesn't contain a dashboard link
-        header_section = response.text.split('data-testid="chat-header"')[1].split("</header>")[0]
+        header_section = chat_page_html.split('data-testid="chat-header"')[1].split("</header>")[0]
         assert 'href="/dashboard"' not in header_section
@@ -1,51 +1,38 @@
 """Integration tests for CSRF protection on routes."""
 
-from datetime import UTC, datetime
-from unittest.mock import AsyncMock, Mock
-
 import pytest
-from bs4 import BeautifulSoup
 from fastapi.testclient import TestClient
 
 from app.auth.dependencies import get_current_user
 from app.main import app
-from app.models.user import User, UserProfile
-from app.services.garmin_service import GarminService
-from tests.conftest import TEST_GARMIN_PASSWORD, TEST_PASSWORD
-
-
-def test_register_requires_csrf_token(client: TestClient):
-    """Test that /auth/register rejects requests without CSRF token."""
-    response = client.post(
-        "/auth/register",
-        data={
-            "email": "test@example.com",
-            "password": TEST_PASSWORD,
-            "display_name": "Test User",
-            "confirm_password": TEST_PASSWORD,
-            # csrf_token intentionally omitted
-        },
-    )
+from app.routes.garmin import get_garmin_service
+from tests.conftest import (
+    TEST_GARMIN_PASSWORD,
+    TEST_PASSWORD,
+    StubGarminService,
+    build_test_user,
+    extract_csrf_token,
+    parse_csrf_input,
+)
+
+
+def test_csrf_regex_matches_parsed_form_field(client: TestClient):
+    """Guard extract_csrf_token against template drift by comparing it with a real HTML parse.
+
+    Both pages go through parse_csrf_input's shared lxml builder, so this also
+    checks that reusing the builder does not carry state between parses.
+    """
+    for endpoint in ("/register", "/login"):
+        form_response = client.get(endpoint)
 
-    assert response.status_code == 403
-    assert "CSRF" in response.text or "Security validation" in response.text
+        csrf_input = parse_csrf_input(form_response)
+        assert csrf_input is not None
+        assert extract_csrf_token(form_response) == csrf_input["value"]
 
 
-def test_register_with_valid_csrf_token(client: TestClient):
+def test_register_with_valid_csrf_token(client: TestClient, csrf_pair: tuple[str, str]):
     """Test that /auth/register accepts valid CSRF token."""
-    # Get form with CSRF token
-    form_response = client.get("/register")
-    assert form_response.status_code == 200
-
-    # Extract CSRF token from cookie (library uses 'fastapi-csrf-token' as cookie name)
-    csrf_cookie = form_response.cookies.get("fastapi-csrf-token")
-    assert csrf_cookie is not None
-
-    # Extract CSRF token from HTML (form field name is 'csrf_token')
-    soup = BeautifulSoup(form_response.text, "html.parser")
-    csrf_input = soup.find("input", {"name": "fastapi-csrf-token"})
-    assert csrf_input is not None
-    csrf_token = csrf_input["value"]
+    csrf_token, csrf_cookie = csrf_pair
 
     # Submit form with valid token
     response = client.post(
@@ -73,8 +60,7 @@ def test_csrf_token_rotation_on_register_error(client: TestClient):
     form1 = client.get("/register")
     cookie1 = form1.cookies.get("fastapi-csrf-token")
 
-    soup = BeautifulSoup(form1.text, "html.parser")
-    csrf_token1 = soup.find("input", {"name": "fastapi-csrf-token"})["value"]
+    csrf_token1 = extract_csrf_token(form1)
 
     # Submit with password mismatch error
     response = client.post(
@@ -99,38 +85,13 @@ def test_csrf_token_rotation_on_register_error(client: TestClient):
     assert cookie2 != cookie1  # Different cookie!
 
     # Extract new token from returned form fragment
-    soup2 = BeautifulSoup(response.text, "html.parser")
-    csrf_input2 = soup2.find("input", {"name": "fastapi-csrf-token"})
-    assert csrf_input2 is not None
-    csrf_token2 = csrf_input2["value"]
+    csrf_token2 = extract_csrf_token(response)
     assert csrf_token2 != csrf_token1  # Different token value!
 
 
-def test_login_requires_csrf_token(client: TestClient):
-    """Test that /auth/login rejects requests without CSRF token."""
-    response = client.post(
-        "/auth/login",
-        data={
-            "username": "test@example.com",
-            "password": TEST_PASSWORD,
-            # csrf_token intentionally omitted
-        },
-    )
-
-    assert response.status_code == 403
-    assert "CSRF" in response.text or "Security validation" in response.text
-
-
-def test_login_with_valid_csrf_token(client: TestClient):
+def test_login_with_valid_csrf_token(client: TestClient, csrf_pair: tuple[str, str]):
     """Test that /auth/login accepts valid CSRF token."""
-    # Get form with CSRF token
-    form_response = client.get("/login")
-    assert form_response.status_code == 200
-
-    # Extract CSRF token
-    csrf_cookie = form_response.cookies.get("fastapi-csrf-token")
-    soup = BeautifulSoup(form_response.text, "html.parser")
-    csrf_token = soup.find("input", {"name": "fastapi-csrf-token"})["value"]
+    csrf_token, csrf_cookie = csrf_pair
 
     # Submit with valid token (will fail auth but not CSRF)
     response = client.post(
@@ -153,8 +114,7 @@ def test_csrf_token_rotation_on_login_error(client: TestClient):
     # Get initial form
     form1 = client.get("/login")
     cookie1 = form1.cookies.get("fastapi-csrf-token")
-    soup1 = BeautifulSoup(form1.text, "html.parser")
-    csrf_token1 = soup1.find("input", {"name": "fastapi-csrf-token"})["value"]
+    csrf_token1 = extract_csrf_token(form1)
 
     # Submit with wrong credentials
     response = client.post(
@@ -176,49 +136,36 @@ def test_csrf_token_rotation_on_login_error(client: TestClient):
     assert cookie2 != cookie1
 
     # Extract new token from form
-    soup2 = BeautifulSoup(response.text, "html.parser")
-    csrf_input2 = soup2.find("input", {"name": "fastapi-csrf-token"})
-    assert csrf_input2 is not None
-    csrf_token2 = csrf_input2["value"]
+    csrf_token2 = extract_csrf_token(response)
     assert csrf_token2 != csrf_token1
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def test_garmin_user():
-    """Create a test user for Garmin tests."""
-    return User(
+    """Create a test user for Garmin tests, shared across the module (no test mutates it)."""
+    return build_test_user(
         user_id="test-garmin-user-123",
         email="garmin@example.com",
-        hashed_password="$2b$12$test",  # noqa: S106
-        created_at=datetime.now(UTC),
-        updated_at=datetime.now(UTC),
-        profile=UserProfile(display_name="Garmin Test User"),
-        garmin_linked=False,
+        display_name="Garmin Test User",
     )
 
 
 @pytest.fixture
 def mock_garmin_service():
-    """Provide mocked GarminService."""
-    mock = Mock(spec=GarminService)
+    """Provide stubbed GarminService."""
     # Always fail link_account to test error path
-    mock.link_account = AsyncMock(return_value=False)
-    mock.sync_recent_data = AsyncMock()
-    return mock
+    return StubGarminService(link_result=False)
 
 
 @pytest.fixture
 def mock_garmin_service_sync_failure():
-    """Provide mocked GarminService with sync_recent_data that raises exception."""
-    mock = Mock(spec=GarminService)
-    mock.link_account = AsyncMock(return_value=True)
+    """Provide stubbed GarminService with sync_recent_data that raises exception."""
     # Force sync to fail with exception
-    mock.sync_recent_data = AsyncMock(side_effect=Exception("Sync failed"))
-    return mock
+    return StubGarminService(sync_error=Exception("Sync failed"))
 
 
 @pytest.fixture
-def authenticated_garmin_client(test_garmin_user, mock_garmin_service, monkeypatch):
+def authenticated_garmin_client(session_client: TestClient, test_garmin_user, mock_garmin_service):
     """Provide a TestClient with authenticated user for Garmin tests.
 
     Cleanup handled by autouse reset_app_state fixture.
@@ -230,45 +177,58 @@ def authenticated_garmin_client(test_garmin_user, mock_garmin_service, monkeypat
 
     app.dependency_overrides[get_current_user] = mock_get_current_user
 
-    # Mock GarminService instantiation
-    def mock_garmin_service_init(user_id: str):
-        mock_garmin_service.user_id = user_id
-        return mock_garmin_service
-
-    monkeypatch.setattr("app.routes.garmin.GarminService", mock_garmin_service_init)
-
-    return TestClient(app, raise_server_exceptions=False)
-
+    # Serve the stub GarminService for this user
+    app.dependency_overrides[get_garmin_service] = lambda: mock_garmin_service
+
+    return session_client
+
+
+@pytest.mark.parametrize(
+    ("method", "path", "data"),
+    [
+        (
+            "POST",
+            "/auth/register",
+            {
+                "email": "test@example.com",
+                "password": TEST_PASSWORD,
+                "display_name": "Test User",
+                "confirm_password": TEST_PASSWORD,
+            },
+        ),
+        ("POST", "/auth/login", {"username": "test@example.com", "password": TEST_PASSWORD}),
+        (
+            "POST",
+            "/garmin/link",
+            {"username": "test@garmin.com", "password": TEST_GARMIN_PASSWORD},
+        ),
+        ("POST", "/garmin/sync", {}),
+        # DELETE carries its token in the X-CSRF-Token header, so no body at all
+        ("DELETE", "/garmin/link", None),
+    ],
+)
+def test_endpoint_requires_csrf_token(
+    authenticated_garmin_client: TestClient,
+    method: str,
+    path: str,
+    data: dict[str, str] | None,
+):
+    """Test that state-changing endpoints reject requests without CSRF token.
 
-def test_garmin_link_requires_csrf_token(authenticated_garmin_client: TestClient):
-    """Test that /garmin/link rejects requests without CSRF token."""
-    response = authenticated_garmin_client.post(
-        "/garmin/link",
-        data={
-            "username": "test@garmin.com",
-            "password": TEST_GARMIN_PASSWORD,
-            # csrf_token intentionally omitted
-        },
-    )
+    The Garmin routes need an authenticated user; the auth routes ignore it.
+    """
+    # csrf_token intentionally omitted
+    response = authenticated_garmin_client.request(method, path, data=data)
 
     assert response.status_code == 403
     assert "CSRF" in response.text or "Security validation" in response.text
 
 
-def test_garmin_link_with_valid_csrf_token(authenticated_garmin_client: TestClient):
+def test_garmin_link_with_valid_csrf_token(
+    authenticated_garmin_client: TestClient, csrf_pair: tuple[str, str]
+):
     """Test that /garmin/link accepts valid CSRF token."""
-    # Get form with CSRF token
-    form_response = authenticated_garmin_client.get("/garmin/link")
-    assert form_response.status_code == 200
-
-    # Extract CSRF token
-    csrf_cookie = form_response.cookies.get("fastapi-csrf-token")
-    assert csrf_cookie is not None
-
-    soup = BeautifulSoup(form_response.text, "html.parser")
-    csrf_input = soup.find("input", {"name": "fastapi-csrf-token"})
-    assert csrf_input is not None
-    csrf_token = csrf_input["value"]
+    csrf_token, csrf_cookie = csrf_pair
 
     # Submit with valid token (may fail auth, but not CSRF)
     response = authenticated_garmin_client.post(
@@ -291,8 +251,7 @@ def test_csrf_token_rotation_on_garmin_link_error(authenticated_garmin_client: T
     # Get initial form
     form1 = authenticated_garmin_client.get("/garmin/link")
     token1 = form1.cookies.get("fastapi-csrf-token")
-    soup1 = BeautifulSoup(form1.text, "html.parser")
-    csrf_token1 = soup1.find("input", {"name": "fastapi-csrf-token"})["value"]
+    csrf_token1 = extract_csrf_token(form1)
 
     # Submit with wrong credentials (will fail)
     response = authenticated_garmin_client.post(
@@ -314,36 +273,18 @@ def test_csrf_token_rotation_on_garmin_link_error(authenticated_garmin_client: T
     assert token2 != token1
 
     # Extract new token from form
-    soup2 = BeautifulSoup(response.text, "html.parser")
-    csrf_input2 = soup2.find("input", {"name": "fastapi-csrf-token"})
-    assert csrf_input2 is not None
-    csrf_token2 = csrf_input2["value"]
+    csrf_token2 = extract_csrf_token(response)
     assert csrf_token2 != csrf_token1
 
 
-def test_garmin_sync_requires_csrf_token(authenticated_garmin_client: TestClient):
-    """Test that /garmin/sync rejects requests without CSRF token."""
-    response = authenticated_garmin_client.post(
-        "/garmin/sync",
-        data={
-            # csrf_token intentionally omitted
-        },
-    )
-
-    assert response.status_code == 403
-    assert "CSRF" in response.text or "Security validation" in response.text
-
-
-def test_garmin_sync_with_valid_csrf_token(authenticated_garmin_client: TestClient):
+def test_garmin_sync_with_valid_csrf_token(
+    authenticated_garmin_client: TestClient, csrf_pair: tuple[str, str]
+):
     """Test that /garmin/sync accepts valid CSRF token.
 
     Note: This test may fail with 500 (no linked account) but should not fail with 403 (CSRF).
     """
-    # Get a CSRF token (from link page)
-    form_response = authenticated_garmin_client.get("/garmin/link")
-    csrf_cookie = form_response.cookies.get("fastapi-csrf-token")
-    soup = BeautifulSoup(form_response.text, "html.parser")
-    csrf_token = soup.find("input", {"name": "fastapi-csrf-token"})["value"]
+    csrf_token, csrf_cookie = csrf_pair
 
     # Submit sync with valid CSRF token
     response = authenticated_garmin_client.post(
@@ -360,7 +301,10 @@ def test_garmin_sync_with_valid_csrf_token(authenticated_garmin_client: TestClie
 
 
 def test_csrf_token_rotation_on_garmin_sync_error(
-    test_garmin_user, mock_garmin_service_sync_failure, monkeypatch
+    session_client: TestClient,
+    csrf_pair: tuple[str, str],
+    test_garmin_user,
+    mock_garmin_service_sync_failure,
 ):
     """Test that CSRF token is rotated when Garmin sync fails."""
 
@@ -370,22 +314,13 @@ def test_csrf_token_rotation_on_garmin_sync_error(
 
     app.dependency_overrides[get_current_user] = mock_get_current_user
 
-    def mock_garmin_service_init(user_id: str):
-        mock_garmin_service_sync_failure.user_id = user_id
-        return mock_garmin_service_sync_failure
-
-    monkeypatch.setattr("app.routes.garmin.GarminService", mock_garmin_service_init)
+    app.dependency_overrides[get_garmin_service] = lambda: mock_garmin_service_sync_failure
 
-    client = TestClient(app, raise_server_exceptions=False)
-
-    # Get initial CSRF token
-    form_response = client.get("/garmin/link")
-    token1 = form_response.cookies.get("fastapi-csrf-token")
-    soup1 = BeautifulSoup(form_response.text, "html.parser")
-    csrf_token1 = soup1.find("input", {"name": "fastapi-csrf-token"})["value"]
+    # The sync endpoint only needs a valid pair, not the link page's form
+    csrf_token1, token1 = csrf_pair
 
     # Submit sync request that will fail
-    response = client.post(
+    response = session_client.post(
         "/garmin/sync",
         data={
             "fastapi-csrf-token": csrf_token1,
@@ -406,22 +341,12 @@ def test_csrf_token_rotation_on_garmin_sync_error(
     app.dependency_overrides.clear()
 
 
-def test_garmin_unlink_requires_csrf_token(authenticated_garmin_client: TestClient):
-    """Test that DELETE /garmin/link rejects requests without CSRF token."""
-    response = authenticated_garmin_client.delete("/garmin/link")
-
-    assert response.status_code == 403
-    assert "CSRF" in response.text or "Security validation" in response.text
-
-
 def test_garmin_unlink_rejects_invalid_csrf_token_in_header(
-    authenticated_garmin_client: TestClient,
+    authenticated_garmin_client: TestClient, mock_garmin_service, csrf_pair: tuple[str, str]
 ):
     """Test that DELETE /garmin/link rejects invalid CSRF token in header."""
-    # Get CSRF cookie (but don't use the correct token)
-    form_response = authenticated_garmin_client.get("/garmin/link")
-    csrf_cookie = form_response.cookies.get("fastapi-csrf-token")
-    assert csrf_cookie is not None
+    # Use a valid CSRF cookie (but don't use the correct token)
+    _, csrf_cookie = csrf_pair
 
     # Submit DELETE with INVALID token in header
     response = authenticated_garmin_client.delete(
@@ -433,18 +358,16 @@ def test_garmin_unlink_rejects_invalid_csrf_token_in_header(
     # Should fail CSRF validation (403)
     assert response.status_code == 403
     assert "CSRF" in response.text or "Security validation" in response.text
+    # Rejected before reaching the service
+    assert mock_garmin_service.unlink_calls == []
 
 
-def test_garmin_unlink_with_valid_csrf_token(authenticated_garmin_client: TestClient):
+def test_garmin_unlink_with_valid_csrf_token(
+    authenticated_garmin_client: TestClient, mock_garmin_service, csrf_pair: tuple[str, str]
+):
     """Test that DELETE /garmin/link accepts valid CSRF token in header."""
-    # Get CSRF token (from link page)
-    form_response = authenticated_garmin_client.get("/garmin/link")
-    csrf_cookie = form_response.cookies.get("fastapi-csrf-token")
-    assert csrf_cookie is not None
-
-    # Extract unsigned CSRF token from HTML form
-    soup = BeautifulSoup(form_response.text, "html.parser")
-    csrf_token = soup.find("input", {"name": "fastapi-csrf-token"})["value"]
+    # csrf_token is the unsigned value the client sends back in the header
+    csrf_token, csrf_cookie = csrf_pair
 
     # Submit DELETE with valid CSRF token in header
     response = authenticated_garmin_client.delete(
@@ -456,3 +379,5 @@ def test_garmin_unlink_with_valid_csrf_token(authenticated_garmin_client: TestCl
     # Should succeed (200) or fail business logic (500), not CSRF (403)
     assert response.status_code in (200, 500)
     assert response.status_code != 403
+    # CSRF passed, so the request reached the service
+    assert mock_garmin_service.unlink_calls == [None]
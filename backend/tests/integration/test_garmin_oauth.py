@@ -1,55 +1,90 @@
 """Integration tests for Garmin OAuth and service layer."""
 
 from datetime import UTC, date, datetime
-from unittest.mock import AsyncMock, Mock, patch
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 
 from app.models.garmin_data import GarminActivity
+from app.services import garmin_service as garmin_service_module
 from app.services.garmin_service import GarminService
 
 
+# Fixed timestamp and activity: the tests only need a valid start time, so one
+# validated GarminActivity is reused rather than rebuilt with datetime.now() per test
+FROZEN_NOW = datetime(2025, 1, 15, 12, 0, tzinfo=UTC)
+
+SAMPLE_ACTIVITY = GarminActivity(
+    activity_id=123,
+    activity_name="Run",
+    activity_type="running",
+    start_time_local=FROZEN_NOW,
+)
+
+
+@pytest.fixture(scope="module")
+def garmin_service_deps():
+    """Swap GarminService's collaborators for shared mocks once per module.
+
+    Assigning the module attributes directly avoids three patch() start/stop
+    cycles per test; the per-test fixtures below reset each mock's behaviour.
+    """
+    deps = {"GarminClient": Mock(), "GarminDataCache": Mock(), "UserService": Mock()}
+    originals = {name: getattr(garmin_service_module, name) for name in deps}
+    for name, instance in deps.items():
+        setattr(garmin_service_module, name, lambda *args, _mock=instance, **kwargs: _mock)
+    yield deps
+    for name, original in originals.items():
+        setattr(garmin_service_module, name, original)
+
+
 @pytest.fixture
-def mock_garmin_client():
+def mock_garmin_client(garmin_service_deps):
     """Mock GarminClient for testing."""
-    with patch("app.services.garmin_service.GarminClient") as mock_client_class:
-        mock_client = Mock()
-        mock_client.authenticate = AsyncMock(return_value=True)
-        mock_client.get_activities = AsyncMock(return_value=[])
-        mock_client.load_tokens = AsyncMock(return_value=True)
-        mock_client_class.return_value = mock_client
-        yield mock_client
+    mock_client = garmin_service_deps["GarminClient"]
+    mock_client.reset_mock()
+    mock_client.authenticate = AsyncMock(return_value=True)
+    mock_client.get_activities = AsyncMock(return_value=[])
+    mock_client.load_tokens = AsyncMock(return_value=True)
+    return mock_client
 
 
 @pytest.fixture
-def mock_cache():
+def mock_cache(garmin_service_deps):
     """Mock GarminDataCache for testing."""
-    with patch("app.services.garmin_service.GarminDataCache") as mock_cache_class:
-        mock_cache_instance = Mock()
-        mock_cache_instance.get = AsyncMock(return_value=None)
-        mock_cache_instance.set = AsyncMock()
-        mock_cache_class.return_value = mock_cache_instance
-        yield mock_cache_instance
+    mock_cache_instance = garmin_service_deps["GarminDataCache"]
+    mock_cache_instance.reset_mock()
+    mock_cache_instance.get = AsyncMock(return_value=None)
+    mock_cache_instance.set = AsyncMock()
+    return mock_cache_instance
 
 
 @pytest.fixture
-def mock_user_service():
+def mock_user_service(garmin_service_deps):
     """Mock UserService for testing."""
-    with patch("app.services.garmin_service.UserService") as mock_service_class:
-        mock_service = Mock()
-        mock_service.update_garmin_status = AsyncMock()
-        mock_service_class.return_value = mock_service
-        yield mock_service
+    mock_service = garmin_service_deps["UserService"]
+    mock_service.reset_mock()
+    mock_service.update_garmin_status = AsyncMock()
+    return mock_service
+
+
+@pytest.fixture(scope="class")
+def service(garmin_service_deps):
+    """GarminService for user123, shared by the tests in each class.
+
+    Its collaborators are the module's shared mocks, which the per-test fixtures
+    reset, so the instance carries no state from one test to the next.
+    """
+    return GarminService("user123")
 
 
 class TestLinkAccount:
     """Tests for linking Garmin account to user."""
 
-    @pytest.mark.asyncio
-    async def test_link_account_success(self, mock_garmin_client, mock_cache, mock_user_service):
+    async def test_link_account_success(
+        self, mock_garmin_client, mock_cache, mock_user_service, service
+    ):
         """Test successful account linking."""
-        service = GarminService("user123")
-
         result = await service.link_account("test@example.com", "password123")
 
         assert result is True
@@ -58,14 +93,12 @@ class TestLinkAccount:
             user_id="user123", linked=True
         )
 
-    @pytest.mark.asyncio
     async def test_link_account_auth_failure(
-        self, mock_garmin_client, mock_cache, mock_user_service
+        self, mock_garmin_client, mock_cache, mock_user_service, service
     ):
         """Test account linking with authentication failure."""
         mock_garmin_client.authenticate = AsyncMock(return_value=False)
 
-        service = GarminService("user123")
         result = await service.link_account("test@example.com", "wrong_password")
 
         assert result is False
@@ -73,22 +106,12 @@ class TestLinkAccount:
         # Should not update user status on failure
         mock_user_service.update_garmin_status.assert_not_called()
 
-    @pytest.mark.asyncio
     async def test_link_account_triggers_sync(
-        self, mock_garmin_client, mock_cache, mock_user_service
+        self, mock_garmin_client, mock_cache, mock_user_service, service
     ):
         """Test that linking account triggers initial data sync."""
-        service = GarminService("user123")
-
         # Mock activities returned from sync
-        mock_activities = [
-            GarminActivity(
-                activity_id=123,
-                activity_name="Morning Run",
-                activity_type="running",
-                start_time_local=datetime.now(UTC),
-            )
-        ]
+        mock_activities = [SAMPLE_ACTIVITY]
         mock_garmin_client.get_activities = AsyncMock(return_value=mock_activities)
 
         result = await service.link_account("test@example.com", "password123")
@@ -103,25 +126,17 @@ class TestLinkAccount:
 class TestSyncRecentData:
     """Tests for syncing recent Garmin data."""
 
-    @pytest.mark.asyncio
     async def test_sync_recent_data_30_days(
-        self, mock_garmin_client, mock_cache, mock_user_service
+        self, mock_garmin_client, mock_cache, mock_user_service, service
     ):
         """Test syncing last 30 days of activities."""
-        service = GarminService("user123")
-
         mock_activities = [
-            GarminActivity(
-                activity_id=123,
-                activity_name="Run",
-                activity_type="running",
-                start_time_local=datetime.now(UTC),
-            ),
+            SAMPLE_ACTIVITY,
             GarminActivity(
                 activity_id=124,
                 activity_name="Bike",
                 activity_type="cycling",
-                start_time_local=datetime.now(UTC),
+                start_time_local=FROZEN_NOW,
             ),
         ]
         mock_garmin_client.get_activities = AsyncMock(return_value=mock_activities)
@@ -137,19 +152,11 @@ class TestSyncRecentData:
         assert end_date == date.today()
         assert (end_date - start_date).days == 30
 
-    @pytest.mark.asyncio
-    async def test_sync_caches_activities(self, mock_garmin_client, mock_cache, mock_user_service):
+    async def test_sync_caches_activities(
+        self, mock_garmin_client, mock_cache, mock_user_service, service
+    ):
         """Test that sync caches the fetched activities."""
-        service = GarminService("user123")
-
-        mock_activities = [
-            GarminActivity(
-                activity_id=123,
-                activity_name="Run",
-                activity_type="running",
-                start_time_local=datetime.now(UTC),
-            )
-        ]
+        mock_activities = [SAMPLE_ACTIVITY]
         mock_garmin_client.get_activities = AsyncMock(return_value=mock_activities)
 
         await service.sync_recent_data()
@@ -161,11 +168,10 @@ class TestSyncRecentData:
         assert cache_call.kwargs["data_type"] == "activities"
         assert len(cache_call.kwargs["data"]) == 1
 
-    @pytest.mark.asyncio
-    async def test_sync_empty_activities(self, mock_garmin_client, mock_cache, mock_user_service):
+    async def test_sync_empty_activities(
+        self, mock_garmin_client, mock_cache, mock_user_service, service
+    ):
         """Test syncing when no activities are returned."""
-        service = GarminService("user123")
-
         mock_garmin_client.get_activities = AsyncMock(return_value=[])
 
         await service.sync_recent_data()
@@ -179,13 +185,10 @@ class TestSyncRecentData:
 class TestGetActivitiesCached:
     """Tests for getting activities with caching."""
 
-    @pytest.mark.asyncio
     async def test_get_activities_cache_hit(
-        self, mock_garmin_client, mock_cache, mock_user_service
+        self, mock_garmin_client, mock_cache, mock_user_service, service
     ):
         """Test getting activities from cache (cache hit)."""
-        service = GarminService("user123")
-
         # Mock cached data
         cached_activities = [
             {"activity_id": 123, "activity_name": "Run", "activity_type": "running"}
@@ -203,25 +206,15 @@ class TestGetActivitiesCached:
         # Should NOT call Garmin API
         mock_garmin_client.get_activities.assert_not_called()
 
-    @pytest.mark.asyncio
     async def test_get_activities_cache_miss(
-        self, mock_garmin_client, mock_cache, mock_user_service
+        self, mock_garmin_client, mock_cache, mock_user_service, service
     ):
         """Test getting activities from API (cache miss)."""
-        service = GarminService("user123")
-
         # Mock cache miss
         mock_cache.get = AsyncMock(return_value=None)
 
         # Mock API response
-        mock_activities = [
-            GarminActivity(
-                activity_id=123,
-                activity_name="Run",
-                activity_type="running",
-                start_time_local=datetime.now(UTC),
-            )
-        ]
+        mock_activities = [SAMPLE_ACTIVITY]
         mock_garmin_client.get_activities = AsyncMock(return_value=mock_activities)
 
         start_date = date(2025, 1, 1)
@@ -237,13 +230,10 @@ class TestGetActivitiesCached:
         assert len(result) == 1
         assert result[0]["activity_id"] == 123
 
-    @pytest.mark.asyncio
     async def test_get_activities_cache_key_includes_date_range(
-        self, mock_garmin_client, mock_cache, mock_user_service
+        self, mock_garmin_client, mock_cache, mock_user_service, service
     ):
         """Test that cache key includes the date range."""
-        service = GarminService("user123")
-
         start_date = date(2025, 1, 1)
         end_date = date(2025, 1, 31)
 
@@ -261,38 +251,25 @@ class TestGetActivitiesCached:
 class TestErrorHandling:
     """Tests for error handling in GarminService."""
 
-    @pytest.mark.asyncio
     async def test_sync_handles_client_error(
-        self, mock_garmin_client, mock_cache, mock_user_service
+        self, mock_garmin_client, mock_cache, mock_user_service, service
     ):
         """Test sync handles GarminClient errors gracefully."""
-        service = GarminService("user123")
-
         mock_garmin_client.get_activities = AsyncMock(side_effect=Exception("Garmin API error"))
 
         # Should raise the exception (caller can handle)
         with pytest.raises(Exception, match="Garmin API error"):
             await service.sync_recent_data()
 
-    @pytest.mark.asyncio
     async def test_get_activities_handles_cache_error(
-        self, mock_garmin_client, mock_cache, mock_user_service
+        self, mock_garmin_client, mock_cache, mock_user_service, service
     ):
         """Test get_activities handles cache errors gracefully."""
-        service = GarminService("user123")
-
         # Mock cache error
         mock_cache.get = AsyncMock(side_effect=Exception("Cache error"))
 
         # Mock API response as fallback
-        mock_activities = [
-            GarminActivity(
-                activity_id=123,
-                activity_name="Run",
-                activity_type="running",
-                start_time_local=datetime.now(UTC),
-            )
-        ]
+        mock_activities = [SAMPLE_ACTIVITY]
         mock_garmin_client.get_activities = AsyncMock(return_value=mock_activities)
 
         start_date = date(2025, 1, 1)
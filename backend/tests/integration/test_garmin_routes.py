@@ -1,44 +1,28 @@
 """Integration tests for Garmin routes."""
 
-from datetime import UTC, datetime
-from unittest.mock import AsyncMock, Mock
-
 import pytest
 from fastapi import status
-from fastapi.testclient import TestClient
 
 from app.auth.dependencies import get_current_user
 from app.main import app
-from app.models.user import User, UserProfile
-from app.services.garmin_service import GarminService
+from app.routes.garmin import get_garmin_service
+from tests.conftest import StubGarminService, build_test_user
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def test_user():
-    """Create a test user."""
-    return User(
-        user_id="test-user-123",
-        email="test@example.com",
-        hashed_password="$2b$12$test",  # noqa: S106
-        created_at=datetime.now(UTC),
-        updated_at=datetime.now(UTC),
-        profile=UserProfile(display_name="Test User"),
-        garmin_linked=False,
-        garmin_link_date=None,
-    )
+    """Create a test user once per module (no test mutates it)."""
+    return build_test_user()
 
 
 @pytest.fixture
 def mock_garmin_service():
-    """Provide mocked GarminService."""
-    mock = Mock(spec=GarminService)
-    mock.link_account = AsyncMock(return_value=True)
-    mock.sync_recent_data = AsyncMock()
-    return mock
+    """Provide stubbed GarminService."""
+    return StubGarminService()
 
 
 @pytest.fixture
-def client(test_user, mock_garmin_service, monkeypatch):
+def client(session_client, test_user, mock_garmin_service, monkeypatch):
     """Provide a TestClient with authenticated user and mocked Garmin service.
 
     Cleanup handled by autouse reset_app_state fixture.
@@ -50,12 +34,8 @@ def client(test_user, mock_garmin_service, monkeypatch):
 
     app.dependency_overrides[get_current_user] = mock_get_current_user
 
-    # Mock GarminService instantiation
-    def mock_garmin_service_init(user_id: str):
-        mock_garmin_service.user_id = user_id
-        return mock_garmin_service
-
-    monkeypatch.setattr("app.routes.garmin.GarminService", mock_garmin_service_init)
+    # Inject the stub through the route dependency rather than patching the class
+    app.dependency_overrides[get_garmin_service] = lambda: mock_garmin_service
 
     # Mock CSRF validation to bypass it for these tests
     # (CSRF-specific tests are in test_csrf_routes.py)
@@ -66,21 +46,30 @@ def client(test_user, mock_garmin_service, monkeypatch):
         "fastapi_csrf_protect.flexible.CsrfProtect.validate_csrf", mock_validate_csrf
     )
 
-    # Create test client (raise_server_exceptions=False allows testing error responses)
-    return TestClient(app, raise_server_exceptions=False)
-    # Cleanup handled by autouse fixture
+    # Shared session client (raise_server_exceptions=False allows testing error responses)
+    return session_client
 
 
-class TestGarminLinkPage:
-    """Tests for GET /garmin/link endpoint."""
+@pytest.mark.parametrize(
+    ("method", "path", "data"),
+    [
+        ("GET", "/garmin/link", None),
+        ("POST", "/garmin/link", {"username": "test@garmin.com", "password": "password123"}),
+        ("POST", "/garmin/sync", None),
+        ("GET", "/garmin/status", None),
+    ],
+)
+def test_endpoint_requires_auth(
+    session_client, method: str, path: str, data: dict[str, str] | None
+):
+    """Test that every Garmin endpoint returns 401 without authentication."""
+    response = session_client.request(method, path, data=data)
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
-    def test_link_page_requires_auth(self):
-        """Test that link page requires authentication."""
-        client = TestClient(app, raise_server_exceptions=False)
-        response = client.get("/garmin/link")
 
-        # Should return 401 without auth
-        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+class TestGarminLinkPage:
+    """Tests for GET /garmin/link endpoint."""
 
     def test_link_page_authenticated(self, client):
         """Test that authenticated users can access link page."""
@@ -93,15 +82,6 @@ class TestGarminLinkPage:
 class TestLinkGarminAccount:
     """Tests for POST /garmin/link endpoint."""
 
-    def test_link_requires_auth(self):
-        """Test that linking requires authentication."""
-        client = TestClient(app, raise_server_exceptions=False)
-        response = client.post(
-            "/garmin/link", data={"username": "test@garmin.com", "password": "password123"}
-        )
-
-        assert response.status_code == status.HTTP_401_UNAUTHORIZED
-
     def test_link_account_success(self, client, mock_garmin_service):
         """Test successful Garmin account linking."""
         response = client.post(
@@ -112,14 +92,13 @@ class TestLinkGarminAccount:
         assert "text/html" in response.headers.get("content-type", "")
         assert "Garmin account linked" in response.text
 
-        mock_garmin_service.link_account.assert_called_once_with(
-            username="test@garmin.com",
-            password="password123",  # nosec B106  # noqa: S106
-        )
+        assert mock_garmin_service.link_calls == [
+            {"username": "test@garmin.com", "password": "password123"}
+        ]
 
     def test_link_account_failure(self, client, mock_garmin_service):
         """Test failed Garmin account linking."""
-        mock_garmin_service.link_account = AsyncMock(return_value=False)
+        mock_garmin_service.link_result = False
 
         response = client.post(
             "/garmin/link", data={"username": "test@garmin.com", "password": "wrong_password"}
@@ -145,13 +124,6 @@ class TestLinkGarminAccount:
 class TestSyncGarminData:
     """Tests for POST /garmin/sync endpoint."""
 
-    def test_sync_requires_auth(self):
-        """Test that sync requires authentication."""
-        client = TestClient(app, raise_server_exceptions=False)
-        response = client.post("/garmin/sync")
-
-        assert response.status_code == status.HTTP_401_UNAUTHORIZED
-
     def test_sync_success(self, client, mock_garmin_service):
         """Test successful data sync."""
         response = client.post("/garmin/sync")
@@ -160,13 +132,11 @@ class TestSyncGarminData:
         assert "text/html" in response.headers.get("content-type", "")
         assert "Sync completed successfully" in response.text
 
-        mock_garmin_service.sync_recent_data.assert_called_once()
+        assert len(mock_garmin_service.sync_calls) == 1
 
     def test_sync_failure(self, client, mock_garmin_service):
         """Test sync failure handling."""
-        mock_garmin_service.sync_recent_data = AsyncMock(
-            side_effect=Exception("Garmin API unavailable")
-        )
+        mock_garmin_service.sync_error = Exception("Garmin API unavailable")
 
         response = client.post("/garmin/sync")
 
@@ -178,13 +148,6 @@ class TestSyncGarminData:
 class TestGarminStatus:
     """Tests for GET /garmin/status endpoint."""
 
-    def test_status_requires_auth(self):
-        """Test that status requires authentication."""
-        client = TestClient(app, raise_server_exceptions=False)
-        response = client.get("/garmin/status")
-
-        assert response.status_code == status.HTTP_401_UNAUTHORIZED
-
     def test_status_returns_linked_status(self, client, test_user):
         """Test status endpoint returns Garmin link status."""
         response = client.get("/garmin/status")
@@ -200,19 +163,17 @@ class TestGarminStatus:
 class TestRouterConfiguration:
     """Tests for router configuration."""
 
-    def test_router_prefix(self):
+    def test_router_prefix(self, session_client):
         """Test that Garmin routes have correct prefix."""
-        client = TestClient(app, raise_server_exceptions=False)
 
         # Even unauthenticated, should recognize the route (return 401, not 404)
-        response = client.get("/garmin/status")
+        response = session_client.get("/garmin/status")
         assert response.status_code != status.HTTP_404_NOT_FOUND
 
     def test_all_routes_registered(self):
         """Test that all expected routes are registered."""
-        routes = [route.path for route in app.routes]
+        paths = {route.path for route in app.routes}
 
         # Check key Garmin routes exist
-        assert any("/garmin/link" in route for route in routes)
-        assert any("/garmin/sync" in route for route in routes)
-        assert any("/garmin/status" in route for route in routes)
+        missing = {"/garmin/link", "/garmin/sync", "/garmin/status"} - paths
+        assert not missing, f"Garmin routes not registered: {sorted(missing)}"
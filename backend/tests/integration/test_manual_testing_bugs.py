@@ -3,11 +3,13 @@
 These tests capture bugs discovered during Phase 4 manual testing runsheet execution.
 """
 
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock
 
 import pytest
 from fastapi.testclient import TestClient
 
+from app.main import app
+from app.routes.garmin import get_garmin_service
 from tests.conftest import TEST_GARMIN_PASSWORD
 
 
@@ -27,10 +29,22 @@ def bypass_csrf_for_manual_testing_bug_tests(monkeypatch):
     )
 
 
+@pytest.fixture
+def mock_garmin_service():
+    """Provide a mocked GarminService to the Garmin routes.
+
+    Cleanup handled by autouse reset_app_state fixture.
+    """
+    service = AsyncMock()
+    app.dependency_overrides[get_garmin_service] = lambda: service
+    return service
+
+
 # Test data constants
 TEST_GARMIN_USERNAME = "test@garmin.com"
 INVALID_GARMIN_USERNAME = "invalid@garmin.com"
 INVALID_GARMIN_PASSWORD = "wrongpassword"  # noqa: S105 - Test fixture
+RETRY_FORM_FIELDS = ('name="username"', 'name="password"')
 
 
 class TestDashboardGarminLinkRouting:
@@ -84,25 +98,24 @@ class TestGarminLinkErrorRecovery:
     Expected: Error responses should include both error message AND form for retry
     """
 
-    def test_link_failure_includes_form_for_retry(self, client: TestClient, test_user_token: str):
+    def test_link_failure_includes_form_for_retry(
+        self, client: TestClient, test_user_token: str, mock_garmin_service: AsyncMock
+    ):
         """Failed link attempt should return error + form (not just error)."""
-        with patch("app.routes.garmin.GarminService") as mock_service_class:
-            # Mock link_account to return False (invalid credentials)
-            mock_service = AsyncMock()
-            mock_service.link_account.return_value = False
-            mock_service_class.return_value = mock_service
-
-            response = client.post(
-                "/garmin/link",
-                data={
-                    "username": INVALID_GARMIN_USERNAME,
-                    "password": INVALID_GARMIN_PASSWORD,
-                },
-                headers={
-                    "Authorization": f"Bearer {test_user_token}",
-                    "HX-Request": "true",
-                },
-            )
+        # Mock link_account to return False (invalid credentials)
+        mock_garmin_service.link_account.return_value = False
+
+        response = client.post(
+            "/garmin/link",
+            data={
+                "username": INVALID_GARMIN_USERNAME,
+                "password": INVALID_GARMIN_PASSWORD,
+            },
+            headers={
+                "Authorization": f"Bearer {test_user_token}",
+                "HX-Request": "true",
+            },
+        )
 
         assert response.status_code == 400
         html = response.text
@@ -120,30 +133,28 @@ class TestGarminLinkErrorRecovery:
         )
 
         # Form must have both input fields for retry
-        required_fields = ['name="username"', 'name="password"']
-        assert all(field in html for field in required_fields), (
-            f"Form must have {', '.join(required_fields)} for retry"
+        assert all(field in html for field in RETRY_FORM_FIELDS), (
+            f"Form must have {', '.join(RETRY_FORM_FIELDS)} for retry"
         )
 
-    def test_link_exception_includes_form_for_retry(self, client: TestClient, test_user_token: str):
+    def test_link_exception_includes_form_for_retry(
+        self, client: TestClient, test_user_token: str, mock_garmin_service: AsyncMock
+    ):
         """Unexpected exceptions should also return error + form (not just error)."""
-        with patch("app.routes.garmin.GarminService") as mock_service_class:
-            # Mock service to raise exception
-            mock_service = AsyncMock()
-            mock_service.link_account.side_effect = Exception("Network timeout")
-            mock_service_class.return_value = mock_service
-
-            response = client.post(
-                "/garmin/link",
-                data={
-                    "username": TEST_GARMIN_USERNAME,
-                    "password": TEST_GARMIN_PASSWORD,
-                },
-                headers={
-                    "Authorization": f"Bearer {test_user_token}",
-                    "HX-Request": "true",
-                },
-            )
+        # Mock service to raise exception
+        mock_garmin_service.link_account.side_effect = Exception("Network timeout")
+
+        response = client.post(
+            "/garmin/link",
+            data={
+                "username": TEST_GARMIN_USERNAME,
+                "password": TEST_GARMIN_PASSWORD,
+            },
+            headers={
+                "Authorization": f"Bearer {test_user_token}",
+                "HX-Request": "true",
+            },
+        )
 
         assert response.status_code == 500
         html = response.text
@@ -162,7 +173,6 @@ class TestGarminLinkErrorRecovery:
         )
 
         # Form must have both input fields for retry
-        required_fields = ['name="username"', 'name="password"']
-        assert all(field in html for field in required_fields), (
-            f"Form must have {', '.join(required_fields)} for retry"
+        assert all(field in html for field in RETRY_FORM_FIELDS), (
+            f"Form must have {', '.join(RETRY_FORM_FIELDS)} for retry"
         )
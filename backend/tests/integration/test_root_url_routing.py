@@ -27,35 +27,6 @@ def test_root_redirects_unauthenticated_to_login(client: TestClient):
     assert response.headers["location"] == "/login"
 
 
-@pytest.mark.skip(reason="Requires complete auth flow - fixture needs rework")
-def test_root_redirects_authenticated_to_chat(client: TestClient, test_user: dict):
-    """
-    Root URL should redirect authenticated users to chat (chat-first navigation).
-
-    Expected: GET / with valid JWT → 303 redirect to /chat
-    Context: Phase 1 - Chat-first navigation (changed from /dashboard to /chat)
-    Note: Code changes validated - redirect implemented in main.py:173
-    """
-    # Login first to get valid JWT (OAuth2PasswordRequestForm expects 'username' not 'email')
-    login_response = client.post(
-        "/auth/login",
-        data={"username": test_user["email"], "password": test_user["password"]},
-        follow_redirects=False,
-    )
-    assert login_response.status_code == 303
-    cookies = login_response.cookies
-
-    # Visit root URL with authenticated session
-    response = client.get("/", cookies=cookies, follow_redirects=False)
-
-    assert response.status_code == 303
-
-    # Phase 1: Chat-first navigation - now redirects to /chat (was /dashboard)
-    assert response.headers["location"] == "/chat", (
-        "Root URL should redirect authenticated users to /chat (chat-first navigation)"
-    )
-
-
 def test_root_with_invalid_token_redirects_to_login(client: TestClient):
     """
     Root URL with invalid/expired JWT should redirect to login.
@@ -94,37 +65,6 @@ def test_root_with_invalid_token_clears_cookie(client: TestClient):
     assert "max-age=0" in set_cookie.lower() or "expires=" in set_cookie.lower()
 
 
-@pytest.mark.skip(reason="Requires complete auth flow - fixture needs rework")
-def test_root_follows_redirect_chain_correctly(client: TestClient, test_user: dict):
-    """
-    Root URL should complete redirect chain to final destination.
-
-    Expected: Authenticated users end up on chat page after redirects
-    Context: Phase 1 - Chat-first navigation (changed from dashboard to chat)
-    Note: Code changes validated - redirect implemented in main.py:173
-    """
-    # Login (OAuth2PasswordRequestForm expects 'username' not 'email')
-    login_response = client.post(
-        "/auth/login",
-        data={"username": test_user["email"], "password": test_user["password"]},
-        follow_redirects=False,
-    )
-    cookies = login_response.cookies
-
-    # Visit root with follow_redirects=True
-    response = client.get("/", cookies=cookies, follow_redirects=True)
-
-    assert response.status_code == 200
-
-    # Phase 1: Chat-first navigation - now ends up on chat page (was dashboard)
-    # Verify we landed on chat page by checking for chat-specific elements
-    from bs4 import BeautifulSoup
-
-    soup = BeautifulSoup(response.text, "html.parser")
-    chat_container = soup.find(id="chat-container")
-    assert chat_container is not None, "Should end up on chat page"
-
-
 def test_root_route_handles_missing_cookie_gracefully(client: TestClient):
     """
     Root URL without any cookies should redirect to login.
@@ -139,10 +79,7 @@ def test_root_route_handles_missing_cookie_gracefully(client: TestClient):
     assert response.headers["location"] == "/login"
 
 
-@pytest.mark.asyncio
-async def test_root_route_checks_jwt_validity_not_just_existence(
-    client: TestClient, test_user: dict
-):
+def test_root_route_checks_jwt_validity_not_just_existence(client: TestClient, test_user: dict):
     """
     Root URL should validate JWT token, not just check if it exists.
 
@@ -195,3 +132,64 @@ def test_dashboard_route_redirects_to_settings(client: TestClient):
     # Dashboard now redirects to /settings permanently
     assert response.status_code == 301, "Dashboard should use 301 (permanent redirect)"
     assert response.headers["location"] == "/settings"
+
+
+class TestPendingAuthFlow:
+    """Root URL tests that need a real login flow through the client fixture.
+
+    Skipped as a group until the fixture can issue valid JWTs end-to-end.
+    """
+
+    pytestmark = pytest.mark.skip(reason="Requires complete auth flow - fixture needs rework")
+
+    def test_root_redirects_authenticated_to_chat(self, client: TestClient, test_user: dict):
+        """
+        Root URL should redirect authenticated users to chat (chat-first navigation).
+
+        Expected: GET / with valid JWT → 303 redirect to /chat
+        Context: Phase 1 - Chat-first navigation (changed from /dashboard to /chat)
+        Note: Code changes validated - redirect implemented in main.py:173
+        """
+        # Login first to get valid JWT (OAuth2PasswordRequestForm expects 'username' not 'email')
+        login_response = client.post(
+            "/auth/login",
+            data={"username": test_user["email"], "password": test_user["password"]},
+            follow_redirects=False,
+        )
+        assert login_response.status_code == 303
+        cookies = login_response.cookies
+
+        # Visit root URL with authenticated session
+        response = client.get("/", cookies=cookies, follow_redirects=False)
+
+        assert response.status_code == 303
+
+        # Phase 1: Chat-first navigation - now redirects to /chat (was /dashboard)
+        assert response.headers["location"] == "/chat", (
+            "Root URL should redirect authenticated users to /chat (chat-first navigation)"
+        )
+
+    def test_root_follows_redirect_chain_correctly(self, client: TestClient, test_user: dict):
+        """
+        Root URL should complete redirect chain to final destination.
+
+        Expected: Authenticated users end up on chat page after redirects
+        Context: Phase 1 - Chat-first navigation (changed from dashboard to chat)
+        Note: Code changes validated - redirect implemented in main.py:173
+        """
+        # Login (OAuth2PasswordRequestForm expects 'username' not 'email')
+        login_response = client.post(
+            "/auth/login",
+            data={"username": test_user["email"], "password": test_user["password"]},
+            follow_redirects=False,
+        )
+        cookies = login_response.cookies
+
+        # Visit root with follow_redirects=True
+        response = client.get("/", cookies=cookies, follow_redirects=True)
+
+        assert response.status_code == 200
+
+        # Phase 1: Chat-first navigation - now ends up on chat page (was dashboard)
+        # Verify we landed on chat page by checking for chat-specific elements
+        assert 'id="chat-container"' in response.text, "Should end up on chat page"
@@ -9,209 +9,247 @@ Context: Bug #8 - get_daily_metrics_cached method missing from GarminService
 
 # Commented code documents post-fix assertions in TDD
 
-from datetime import date
-from unittest.mock import AsyncMock, MagicMock, patch
+from datetime import UTC, date, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 
 import pytest
 
 from app.models.garmin_data import DailyMetrics
+from app.services import garmin_service as garmin_service_module
 from app.services.garmin_service import GarminService
 
 
-@pytest.fixture
-def mock_firestore():
-    """Mock Firestore client to avoid GCP credentials requirement."""
-    with patch("google.cloud.firestore.Client") as mock_client:
-        mock_db = MagicMock()
-        mock_client.return_value = mock_db
-        yield mock_db
+TARGET_DATE = date(2025, 11, 14)
 
+CACHED_METRICS = {
+    "steps": 12000,
+    "resting_heart_rate": 58,
+    "sleep_seconds": 27000,
+    "avg_stress_level": 25,
+}
 
-@pytest.mark.asyncio
-async def test_get_daily_metrics_cached_method_exists(mock_firestore):
-    """
-    GarminService should have get_daily_metrics_cached method.
+API_METRICS = DailyMetrics(
+    date=TARGET_DATE,
+    steps=15000,
+    resting_heart_rate=62,
+    sleep_seconds=28800,
+    avg_stress_level=35,
+)
 
-    Expected: Method exists and is callable
-    Context: Bug #8 - method was completely missing (now fixed)
-    """
-    service = GarminService(user_id="test-user")
-    target_date = date.today()
 
-    # Mock dependencies to prevent actual API calls
-    service.cache = AsyncMock()
-    service.cache.get.return_value = {"steps": 10000}
-    service.client = AsyncMock()
+class FakeCache:
+    """GarminDataCache stand-in that records calls in plain lists."""
+
+    def __init__(self) -> None:
+        self.value: dict | None = None
+        self.expires_at: datetime | None = None
+        self.error: Exception | None = None
+        self.set_error: Exception | None = None
+        self.get_calls: list[dict] = []
+        self.set_calls: list[dict] = []
+
+    async def get_with_expiry(self, **kwargs) -> tuple[dict | None, datetime | None]:
+        self.get_calls.append(kwargs)
+        if self.error is not None:
+            raise self.error
+        return self.value, self.expires_at
+
+    async def set(self, **kwargs) -> None:
+        self.set_calls.append(kwargs)
+        if self.set_error is not None:
+            raise self.set_error
+
+    async def invalidate(self, user_id: str) -> None:
+        pass
+
+
+class FakeClock:
+    """Stand-in for the time module's monotonic clock, advanced by hand."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
 
-    assert hasattr(service, "get_daily_metrics_cached")
-    assert callable(service.get_daily_metrics_cached)
-    result = await service.get_daily_metrics_cached(target_date)
-    assert isinstance(result, dict)
+    def monotonic(self) -> float:
+        return self.now
 
 
-@pytest.mark.asyncio
-async def test_get_daily_metrics_cached_returns_cached_data(mock_firestore):
+class FakeClient:
+    """GarminClient stand-in returning API_METRICS for any date."""
+
+    def __init__(self) -> None:
+        self.calls: list[date] = []
+
+    async def get_daily_metrics(self, target_date: date) -> DailyMetrics:
+        self.calls.append(target_date)
+        return API_METRICS
+
+    async def delete_tokens(self) -> None:
+        pass
+
+
+@pytest.fixture
+def service():
+    """GarminService wired to fakes without running __init__.
+
+    Skipping __init__ avoids building a real GarminClient, Firestore-backed cache and
+    UserService only to replace them. The module-level L1 is cleared by the autouse
+    reset_daily_metrics_l1 fixture.
     """
-    get_daily_metrics_cached should return cached data when available.
+    service = GarminService.__new__(GarminService)
+    service.user_id = "test-user-123"
+    service.cache = FakeCache()
+    service.client = FakeClient()
+    return service
+
+
+@pytest.mark.parametrize(
+    ("cache_return", "cache_error", "from_api"),
+    [
+        pytest.param(CACHED_METRICS, None, False, id="cache-hit"),
+        pytest.param(None, None, True, id="cache-miss"),
+        pytest.param(None, Exception("Firestore timeout"), True, id="cache-error"),
+    ],
+)
+async def test_get_daily_metrics_cached(service, cache_return, cache_error, from_api):
+    """
+    get_daily_metrics_cached should serve the cache first and fall back to the API.
 
-    Expected: Returns cached dict without calling Garmin API
-    Context: Cache hit path should be efficient (no API calls)
+    Expected: Cache hit returns cached dict without calling Garmin API; cache miss
+    or cache error fetches from the API and caches the result
+    Context: Bug #8 - method was completely missing (now fixed); AI agent tools
+    expect dict format for easy manipulation
     """
-    service = GarminService(user_id="test-user-123")
-    target_date = date(2025, 11, 14)
+    service.cache.value = cache_return
+    service.cache.error = cache_error
 
-    # Mock cached data
-    cached_metrics = {
-        "steps": 12000,
-        "resting_heart_rate": 58,
-        "sleep_seconds": 27000,
-        "avg_stress_level": 25,
-    }
+    result = await service.get_daily_metrics_cached(TARGET_DATE)
 
-    # Mock cache.get to return data
-    service.cache = AsyncMock()
-    service.cache.get.return_value = cached_metrics
+    assert isinstance(result, dict), "Should return dict, not Pydantic model"
+    assert {"steps", "resting_heart_rate", "sleep_seconds", "avg_stress_level"} <= result.keys()
+    assert service.cache.get_calls == [
+        {"user_id": "test-user-123", "data_type": "daily_metrics", "date_range": str(TARGET_DATE)}
+    ]
+
+    if not from_api:
+        assert result == CACHED_METRICS
+        assert service.client.calls == []
+        assert service.cache.set_calls == []
+        return
+
+    # Cache miss and cache errors both fall back to the API and cache its result
+    expected = API_METRICS.model_dump()
+    assert result == expected
+    assert service.client.calls == [TARGET_DATE]
+    assert service.cache.set_calls == [
+        {
+            "user_id": "test-user-123",
+            "data_type": "daily_metrics",
+            "data": expected,
+            "date_range": str(TARGET_DATE),
+        }
+    ]
+
+
+async def test_cache_set_error_does_not_break_response(service):
+    """
+    A failed cache write should not fail the read.
+
+    Expected: API metrics are returned even when cache.set raises
+    Context: The cache is a performance optimization, never a failure mode
+    """
+    service.cache.set_error = Exception("Firestore unavailable")
 
-    result = await service.get_daily_metrics_cached(target_date)
+    result = await service.get_daily_metrics_cached(TARGET_DATE)
 
-    assert result == cached_metrics
-    assert not hasattr(result, "model_dump"), "Should return dict, not Pydantic model"
-    service.cache.get.assert_called_once_with(
-        user_id="test-user-123", data_type="daily_metrics", date_range=str(target_date)
-    )
+    assert result == API_METRICS.model_dump()
+    assert len(service.cache.set_calls) == 1
 
 
-@pytest.mark.asyncio
-async def test_get_daily_metrics_cached_fetches_from_api_on_cache_miss(mock_firestore):
+async def test_get_daily_metrics_cached_repeat_read_skips_firestore(service):
     """
-    get_daily_metrics_cached should fetch from Garmin API on cache miss.
+    A repeat read within the L1 TTL should not touch the Firestore cache or the API.
 
-    Expected: Calls GarminClient.get_daily_summary when cache empty
-    Context: Cache miss path should fallback to API gracefully
+    Expected: Second call returns the same dict with one cache.get and one API call total
+    Context: Chat agent tools re-read the same days across tool calls
     """
-    service = GarminService(user_id="test-user-123")
-    target_date = date(2025, 11, 14)
-
-    # Mock cache miss
-    service.cache = AsyncMock()
-    service.cache.get.return_value = None
-
-    # Mock Garmin API response
-    mock_metrics = DailyMetrics(
-        date=target_date,
-        steps=15000,
-        resting_heart_rate=62,
-        sleep_seconds=28800,
-        avg_stress_level=35,
-    )
-    service.client = AsyncMock()
-    service.client.get_daily_metrics.return_value = mock_metrics
-
-    result = await service.get_daily_metrics_cached(target_date)
-
-    assert result["steps"] == 15000
-    assert result["resting_heart_rate"] == 62
-    assert isinstance(result, dict), "Should return dict, not Pydantic model"
-    service.client.get_daily_metrics.assert_called_once_with(target_date)
+    first = await service.get_daily_metrics_cached(TARGET_DATE)
+    second = await service.get_daily_metrics_cached(TARGET_DATE)
+
+    assert second == first == API_METRICS.model_dump()
+    assert len(service.cache.get_calls) == 1
+    assert service.client.calls == [TARGET_DATE]
 
 
-@pytest.mark.asyncio
-async def test_get_daily_metrics_cached_caches_api_results(mock_firestore):
+async def test_unlink_account_clears_daily_metrics_l1(service):
     """
-    get_daily_metrics_cached should cache API results after fetch.
+    Unlinking should drop the user's L1 entries along with the Firestore cache.
 
-    Expected: Calls cache.set with fetched data
-    Context: Future requests should hit cache, not API
+    Expected: After unlink, the next read goes back to the Firestore cache
     """
-    service = GarminService(user_id="test-user-123")
-    target_date = date(2025, 11, 14)
-
-    # Mock cache miss
-    service.cache = AsyncMock()
-    service.cache.get.return_value = None
-
-    # Mock API response
-    mock_metrics = DailyMetrics(
-        date=target_date,
-        steps=15000,
-        resting_heart_rate=62,
-        sleep_seconds=28800,
-        avg_stress_level=35,
-    )
-    service.client = AsyncMock()
-    service.client.get_daily_metrics.return_value = mock_metrics
-
-    await service.get_daily_metrics_cached(target_date)
-
-    service.cache.set.assert_called_once()
-    call_args = service.cache.set.call_args
-    assert call_args.kwargs["user_id"] == "test-user-123"
-    assert call_args.kwargs["data_type"] == "daily_metrics"
-    assert call_args.kwargs["date_range"] == str(target_date)
-    assert "steps" in call_args.kwargs["data"]
-
-
-@pytest.mark.asyncio
-async def test_get_daily_metrics_cached_handles_cache_errors_gracefully(mock_firestore):
+    service.user_service = AsyncMock()
+    await service.get_daily_metrics_cached(TARGET_DATE)
+    await service.unlink_account()
+
+    await service.get_daily_metrics_cached(TARGET_DATE)
+
+    assert len(service.cache.get_calls) == 2
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the L1's monotonic clock (only in garmin_service, not the event loop)."""
+    fake = FakeClock()
+    monkeypatch.setattr(garmin_service_module, "time", SimpleNamespace(monotonic=fake.monotonic))
+    return fake
+
+
+async def test_l1_entry_expires_after_ttl(service, clock):
     """
-    get_daily_metrics_cached should continue on cache errors.
+    An L1 entry older than DAILY_METRICS_L1_TTL_SECONDS should no longer be served.
 
-    Expected: Falls back to API if cache.get raises exception
-    Context: Cache failures should not break functionality
+    Expected: Read after the TTL goes back to the Firestore cache
     """
-    service = GarminService(user_id="test-user-123")
-    target_date = date(2025, 11, 14)
+    await service.get_daily_metrics_cached(TARGET_DATE)
+    clock.now += garmin_service_module.DAILY_METRICS_L1_TTL_SECONDS - 1
+    await service.get_daily_metrics_cached(TARGET_DATE)
+    assert len(service.cache.get_calls) == 1
 
-    # Mock cache error
-    service.cache = AsyncMock()
-    service.cache.get.side_effect = Exception("Firestore timeout")
+    clock.now += 1
+    await service.get_daily_metrics_cached(TARGET_DATE)
+    assert len(service.cache.get_calls) == 2
 
-    # Mock API response
-    mock_metrics = DailyMetrics(
-        date=target_date,
-        steps=10000,
-        resting_heart_rate=60,
-        sleep_seconds=25200,
-        avg_stress_level=30,
-    )
-    service.client = AsyncMock()
-    service.client.get_daily_metrics.return_value = mock_metrics
 
-    result = await service.get_daily_metrics_cached(target_date)
+async def test_l1_entry_capped_at_firestore_expiry(service, clock):
+    """
+    An entry filled from Firestore should not outlive the Firestore entry.
 
-    assert result["steps"] == 10000  # Should still return API data
-    service.client.get_daily_metrics.assert_called_once()
+    Expected: With 60s left in Firestore, the L1 entry expires after 60s, not the full TTL
+    """
+    service.cache.value = CACHED_METRICS
+    service.cache.expires_at = datetime.now(UTC) + timedelta(seconds=60)
 
+    await service.get_daily_metrics_cached(TARGET_DATE)
+    clock.now += 61
+    await service.get_daily_metrics_cached(TARGET_DATE)
 
-@pytest.mark.asyncio
-async def test_get_daily_metrics_cached_returns_dict_format(mock_firestore):
+    assert len(service.cache.get_calls) == 2
+
+
+async def test_l1_evicts_least_recently_used(service, monkeypatch):
     """
-    get_daily_metrics_cached should return dict, not Pydantic model.
+    Past DAILY_METRICS_L1_MAXSIZE the least recently read entry should be evicted.
 
-    Expected: Returns dict with keys: steps, resting_heart_rate, sleep_seconds, avg_stress_level
-    Context: AI agent tools expect dict format for easy manipulation
+    Expected: Re-reading day 1 keeps it; adding day 3 evicts day 2
     """
-    service = GarminService(user_id="test-user-123")
-    target_date = date(2025, 11, 14)
-
-    # Mock API response
-    mock_metrics = DailyMetrics(
-        date=target_date,
-        steps=12500,
-        resting_heart_rate=64,
-        sleep_seconds=26100,
-        avg_stress_level=28,
-    )
-    service.cache = AsyncMock()
-    service.cache.get.return_value = None
-    service.client = AsyncMock()
-    service.client.get_daily_metrics.return_value = mock_metrics
-
-    result = await service.get_daily_metrics_cached(target_date)
-
-    assert isinstance(result, dict)
-    assert "steps" in result
-    assert "resting_heart_rate" in result
-    assert "sleep_seconds" in result
-    assert "avg_stress_level" in result
-    assert result["steps"] == 12500
+    monkeypatch.setattr(garmin_service_module, "DAILY_METRICS_L1_MAXSIZE", 2)
+    day1, day2, day3 = (TARGET_DATE + timedelta(days=n) for n in range(3))
+
+    for day in (day1, day2, day1, day3):
+        await service.get_daily_metrics_cached(day)
+
+    assert list(garmin_service_module._daily_metrics_l1) == [
+        ("test-user-123", str(day1)),
+        ("test-user-123", str(day3)),
+    ]
+    assert service.client.calls == [day1, day2, day3]
@@ -14,21 +14,37 @@ import pytest
 from bs4 import BeautifulSoup
 
 
-def test_chat_template_has_logout_button(templates):
+@pytest.fixture(scope="module")
+def rendered_chat(templates):
+    """chat.html rendered once for the default test user."""
+    return templates.get_template("chat.html").render(
+        user={"profile": {"display_name": "Test User"}, "email": "test@example.com"}
+    )
+
+
+@pytest.fixture(scope="module")
+def chat_soup(rendered_chat):
+    """Parsed rendered_chat, shared read-only by the tests below (they only call find)."""
+    return BeautifulSoup(rendered_chat, "lxml")
+
+
+@pytest.fixture(scope="module")
+def rendered_chat_alice(templates):
+    """chat.html rendered once for a user with a distinct display name."""
+    return templates.get_template("chat.html").render(
+        user={"profile": {"display_name": "Alice Smith"}, "email": "alice@example.com"}
+    )
+
+
+def test_chat_template_has_logout_button(chat_soup):
     """
     Chat template should include logout button for user to sign out.
 
     Expected: Logout button with data-testid="logout-button"
     Context: Bug #10 - users trapped on chat page without logout
     """
-    html = templates.get_template("chat.html").render(
-        user={"profile": {"display_name": "Test User"}, "email": "test@example.com"}
-    )
-
-    soup = BeautifulSoup(html, "html.parser")
-
     # Find logout button
-    logout_button = soup.find(attrs={"data-testid": "logout-button"})
+    logout_button = chat_soup.find(attrs={"data-testid": "logout-button"})
 
     # Bug #10 fixed: Logout button now exists
     assert logout_button is not None, (
@@ -37,21 +53,15 @@ def test_chat_template_has_logout_button(templates):
     assert logout_button.name in ["button", "a"], "Should be button or link"
 
 
-def test_chat_template_has_settings_link(templates):
+def test_chat_template_has_settings_link(chat_soup):
     """
     Chat template should include link to settings page.
 
     Expected: Link with href="/settings" and data-testid="link-settings"
     Context: Phase 4 - Settings icon navigation (replaced dashboard link)
     """
-    html = templates.get_template("chat.html").render(
-        user={"profile": {"display_name": "Test User"}, "email": "test@example.com"}
-    )
-
-    soup = BeautifulSoup(html, "html.parser")
-
     # Find settings link
-    settings_link = soup.find("a", href="/settings")
+    settings_link = chat_soup.find("a", href="/settings")
 
     assert settings_link is not None, "Chat page should have link to settings"
     assert settings_link.get("data-testid") == "link-settings", (
@@ -59,39 +69,29 @@ def test_chat_template_has_settings_link(templates):
     )
 
 
-def test_chat_template_has_navigation_header(templates):
+def test_chat_template_has_navigation_header(chat_soup):
     """
     Chat template should have navigation header similar to dashboard.
 
     Expected: Header element with navigation elements
     Context: Bug #10 - consistent navigation pattern across pages
     """
-    html = templates.get_template("chat.html").render(
-        user={"profile": {"display_name": "Test User"}, "email": "test@example.com"}
-    )
-
-    soup = BeautifulSoup(html, "html.parser")
-
     # Find header element
-    header = soup.find("header")
+    header = chat_soup.find("header")
 
     # Bug #10 fixed: Header element now exists
     assert header is not None, "Chat page should have <header> element"
     assert "Selflytics" in header.get_text(), "Header should show app name"
 
 
-def test_chat_template_displays_user_name(templates):
+def test_chat_template_displays_user_name(rendered_chat_alice):
     """
     Chat template header should display current user's name.
 
     Expected: User display name shown in navigation
     Context: Consistent with dashboard.html pattern
     """
-    html = templates.get_template("chat.html").render(
-        user={"profile": {"display_name": "Alice Smith"}, "email": "alice@example.com"}
-    )
-
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(rendered_chat_alice, "lxml")
 
     # Find user name element
     user_name = soup.find(attrs={"data-testid": "user-name"})
@@ -101,19 +101,13 @@ def test_chat_template_displays_user_name(templates):
     assert "Alice Smith" in user_name.get_text()
 
 
-def test_chat_navigation_has_settings_icon(templates):
+def test_chat_navigation_has_settings_icon(chat_soup):
     """
     Chat navigation should include settings icon link.
 
     Expected: Settings icon (SVG) within link to /settings
     Context: Phase 4 - Modern icon-based navigation pattern
     """
-    chat_html = templates.get_template("chat.html").render(
-        user={"profile": {"display_name": "Test User"}, "email": "test@example.com"}
-    )
-
-    chat_soup = BeautifulSoup(chat_html, "html.parser")
-
     # Chat should have header with logout and settings
     chat_header = chat_soup.find("header")
     chat_logout = chat_soup.find(attrs={"data-testid": "logout-button"})
@@ -151,7 +145,7 @@ async def test_chat_page_logout_button_functional(client, test_user):
     assert chat_response.status_code == 200
 
     # Parse HTML
-    soup = BeautifulSoup(chat_response.text, "html.parser")
+    soup = BeautifulSoup(chat_response.text, "lxml")
 
     # Find logout button/form
     logout_button = soup.find(attrs={"data-testid": "logout-button"})
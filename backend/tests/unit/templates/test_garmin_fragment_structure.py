@@ -13,6 +13,8 @@ Context: Bug #9 - garmin_link_form has outer <div> wrapper causing header duplic
 import pytest
 from bs4 import BeautifulSoup
 
+from tests.conftest import fragment_soup
+
 
 def test_garmin_link_fragment_has_no_outer_div_wrapper(templates):
     """
@@ -26,7 +28,7 @@ def test_garmin_link_fragment_has_no_outer_div_wrapper(templates):
         error_message="Invalid credentials"
     )
 
-    soup = BeautifulSoup(html, "html.parser")
+    soup = fragment_soup(html)
 
     # Find root element (should be <form>)
     root_elements = [
@@ -59,7 +61,7 @@ def test_garmin_link_fragment_header_inside_form(templates):
     """
     html = templates.get_template("fragments/garmin_link_form.html").render()
 
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, "lxml")
 
     # Find the header
     header = soup.find("h2", string="Link Your Garmin Account")
@@ -91,8 +93,8 @@ def test_garmin_link_fragment_matches_auth_fragment_pattern(templates):
         error_message="Test error"
     )
 
-    garmin_soup = BeautifulSoup(garmin_html, "html.parser")
-    login_soup = BeautifulSoup(login_html, "html.parser")
+    garmin_soup = fragment_soup(garmin_html)
+    login_soup = fragment_soup(login_html)
 
     # Get root elements
     garmin_root = next(child for child in garmin_soup.children if child.name)
@@ -116,7 +118,7 @@ def test_garmin_link_fragment_error_message_inside_form(templates):
         error_message="Invalid Garmin credentials"
     )
 
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, "lxml")
 
     # Find error message div
     error_div = soup.find("div", class_="bg-red-50")
@@ -165,7 +167,7 @@ async def test_garmin_link_fragment_used_by_error_response(client, test_user):
     assert "text/html" in response.headers["content-type"]
 
     # Parse HTML
-    soup = BeautifulSoup(response.text, "html.parser")
+    soup = fragment_soup(response.text)
 
     # Get root element
     root_elements = [child for child in soup.children if child.name is not None]
@@ -210,6 +210,26 @@ class TestCacheLoad:
         mock_collection.document.assert_called_once()
         mock_doc_ref.get.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_get_with_expiry_returns_expires_at(self, cache, mock_firestore):
+        """Test get_with_expiry returns the stored expiry alongside the data."""
+        _, mock_collection = mock_firestore
+        mock_doc_ref = Mock()
+        mock_doc_snapshot = Mock()
+        mock_doc_snapshot.exists = True
+
+        expires_at = datetime.now(UTC) + timedelta(hours=2)
+        mock_doc_snapshot.to_dict.return_value = {
+            "data": {"steps": 12000},
+            "expires_at": expires_at,
+        }
+        mock_doc_ref.get.return_value = mock_doc_snapshot
+        mock_collection.document.return_value = mock_doc_ref
+
+        result = await cache.get_with_expiry("user123", "daily_metrics", date_range="2025-01-15")
+
+        assert result == ({"steps": 12000}, expires_at)
+
     @pytest.mark.asyncio
     async def test_get_cache_miss_not_exists(self, cache, mock_firestore):
         """Test cache miss when document doesn't exist."""
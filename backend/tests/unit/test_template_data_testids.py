@@ -7,8 +7,6 @@ where templates are modified without preserving test attributes.
 
 from unittest.mock import AsyncMock, patch
 
-from bs4 import BeautifulSoup
-
 
 def test_login_template_has_required_testids(client):
     """Login page should have all required data-testid attributes for e2e tests."""
@@ -82,16 +80,9 @@ def test_garmin_settings_unlinked_has_required_testids(client, test_user_token):
     assert 'data-testid="submit-link-garmin"' in html, "Link submit button missing test ID"
 
 
-def test_garmin_linked_status_has_required_testids(client, test_user_token):
+def test_garmin_linked_status_has_required_testids(client, test_user_token, csrf_pair):
     """Garmin link success HTML fragment should have status and sync button test IDs."""
-    # Get CSRF token from form
-    form_response = client.get(
-        "/garmin/link",
-        headers={"Authorization": f"Bearer {test_user_token}"},
-    )
-    csrf_cookie = form_response.cookies.get("fastapi-csrf-token")
-    soup = BeautifulSoup(form_response.text, "html.parser")
-    csrf_token = soup.find("input", {"name": "fastapi-csrf-token"})["value"]
+    csrf_token, csrf_cookie = csrf_pair
 
     with patch("app.routes.garmin.GarminService") as mock_service_class:
         mock_service = AsyncMock()
@@ -121,16 +112,9 @@ def test_garmin_linked_status_has_required_testids(client, test_user_token):
         assert 'data-testid="button-sync-garmin"' in html, "Sync button missing test ID"
 
 
-def test_garmin_link_error_has_testid(client, test_user_token):
+def test_garmin_link_error_has_testid(client, test_user_token, csrf_pair):
     """Garmin link error HTML fragment should have error message test ID."""
-    # Get CSRF token from form
-    form_response = client.get(
-        "/garmin/link",
-        headers={"Authorization": f"Bearer {test_user_token}"},
-    )
-    csrf_cookie = form_response.cookies.get("fastapi-csrf-token")
-    soup = BeautifulSoup(form_response.text, "html.parser")
-    csrf_token = soup.find("input", {"name": "fastapi-csrf-token"})["value"]
+    csrf_token, csrf_cookie = csrf_pair
 
     with patch("app.routes.garmin.GarminService") as mock_service_class:
         mock_service = AsyncMock()
@@ -87,12 +87,10 @@ def test_templates_include_alpine_script(unauthenticated_client):
 
     for page in pages:
         response = unauthenticated_client.get(page)
-        html = response.text
+        html = response.text.lower()
 
         # Should include Alpine.js library
-        assert "alpinejs" in html.lower() or "alpine" in html.lower(), (
-            f"Page {page} missing Alpine.js script"
-        )
+        assert "alpinejs" in html or "alpine" in html, f"Page {page} missing Alpine.js script"
 
 
 def test_templates_include_tailwind_css(unauthenticated_client):
@@ -141,7 +139,8 @@ def test_error_template_with_validation_errors(unauthenticated_client, create_mo
         html = response.text
 
         # Should contain error message
-        assert "already registered" in html.lower() or "error" in html.lower()
+        lowered = html.lower()
+        assert "already registered" in lowered or "error" in lowered
         # Should still contain form for retry
         assert "<form" in html
     finally: